@@ -2,56 +2,47 @@
 """
 Stream Server for Screenshot Narrator
 Provides HTTP endpoint to stream narration events in real-time
+Runs on Starlette + uvicorn so every SSE client shares one event loop
 """
 
-from flask import Flask, Response, jsonify
-import json
-import time
-from pathlib import Path
+import asyncio
+import orjson
 from datetime import datetime
-import threading
-import queue
+from collections import deque
+import uvicorn
+from starlette.applications import Starlette
+from starlette.responses import HTMLResponse, JSONResponse, StreamingResponse
+from starlette.routing import Route
 
-app = Flask(__name__)
-
-# Global queue for events
-event_queue = queue.Queue()
-latest_events = []
 MAX_EVENTS = 50
+latest_events = deque(maxlen=MAX_EVENTS)  # Oldest events are evicted automatically
+LISTENER_QUEUE_SIZE = 100  # Clients that fall this far behind are dropped (their stream is closed)
 
 class EventBroadcaster:
     """Broadcasts events to all connected clients"""
     def __init__(self):
-        self.listeners = []
-        self.lock = threading.Lock()
+        # Only touched from the event loop, so no lock is needed
+        self.listeners = set()
     
     def add_listener(self, q):
-        with self.lock:
-            self.listeners.append(q)
+        self.listeners.add(q)
     
     def remove_listener(self, q):
-        with self.lock:
-            if q in self.listeners:
-                self.listeners.remove(q)
+        self.listeners.discard(q)
     
     def broadcast(self, event):
-        with self.lock:
-            # Add to latest events
-            latest_events.append(event)
-            if len(latest_events) > MAX_EVENTS:
-                latest_events.pop(0)
-            
-            # Broadcast to all listeners
-            dead_listeners = []
-            for listener in self.listeners:
-                try:
-                    listener.put(event)
-                except:
-                    dead_listeners.append(listener)
-            
-            # Remove dead listeners
-            for listener in dead_listeners:
-                self.listeners.remove(listener)
+        # Add to latest events
+        latest_events.append(event)
+        
+        # Broadcast to all listeners (iterate a snapshot so dead ones can be dropped)
+        for listener in tuple(self.listeners):
+            try:
+                listener.put_nowait(event)
+            except asyncio.QueueFull:
+                self.listeners.discard(listener)
+                # Make room for a close sentinel so the client's stream ends instead of waiting forever
+                listener.get_nowait()
+                listener.put_nowait(None)
 
 broadcaster = EventBroadcaster()
 
@@ -64,10 +55,7 @@ def add_event(event_type, data):
     }
     broadcaster.broadcast(event)
 
-@app.route('/')
-def index():
-    """Show simple HTML page with event stream"""
-    return """
+INDEX_HTML = """
 <!DOCTYPE html>
 <html>
 <head>
@@ -222,65 +210,75 @@ def index():
 </html>
 """
 
-@app.route('/stream')
-def stream():
+async def index(request):
+    """Show simple HTML page with event stream"""
+    return HTMLResponse(INDEX_HTML)
+
+async def stream(request):
     """Server-Sent Events stream"""
-    def event_stream():
+    async def event_stream():
         # Create a queue for this client
-        q = queue.Queue()
+        q = asyncio.Queue(maxsize=LISTENER_QUEUE_SIZE)
         broadcaster.add_listener(q)
         
         try:
             # Send recent events first
-            for event in latest_events[-10:]:
-                yield f"data: {json.dumps(event)}\n\n"
+            for event in list(latest_events)[-10:]:
+                yield f"data: {orjson.dumps(event).decode()}\n\n"
             
             # Then stream new events
             while True:
-                event = q.get()
-                yield f"data: {json.dumps(event)}\n\n"
-        except GeneratorExit:
+                event = await q.get()
+                if event is None:  # Dropped for falling behind
+                    break
+                yield f"data: {orjson.dumps(event).decode()}\n\n"
+        finally:
+            # Runs when the client disconnects and the generator is cancelled
             broadcaster.remove_listener(q)
     
-    return Response(event_stream(), mimetype='text/event-stream')
+    return StreamingResponse(event_stream(), media_type='text/event-stream')
 
-@app.route('/events')
-def get_events():
+async def get_events(request):
     """Get latest events as JSON"""
-    return jsonify({
-        "events": latest_events[-20:],
+    return JSONResponse({
+        "events": list(latest_events)[-20:],
         "count": len(latest_events)
     })
 
-@app.route('/broadcast', methods=['POST'])
-def broadcast():
+async def broadcast(request):
     """Receive events from clients"""
-    from flask import request
     try:
-        data = request.get_json()
+        data = orjson.loads(await request.body())
         event_type = data.get('type', 'unknown')
         event_data = data.get('data', {})
         add_event(event_type, event_data)
-        return jsonify({"status": "ok"})
+        return JSONResponse({"status": "ok"})
     except Exception as e:
-        return jsonify({"status": "error", "message": str(e)}), 400
+        return JSONResponse({"status": "error", "message": str(e)}, status_code=400)
 
-@app.route('/health')
-def health():
+async def health(request):
     """Health check endpoint"""
-    return jsonify({
+    return JSONResponse({
         "status": "ok",
         "listeners": len(broadcaster.listeners),
         "events": len(latest_events)
     })
 
+app = Starlette(routes=[
+    Route('/', index),
+    Route('/stream', stream),
+    Route('/events', get_events),
+    Route('/broadcast', broadcast, methods=['POST']),
+    Route('/health', health)
+])
+
 def run_server(port=5001):
-    """Run the Flask server"""
+    """Run the ASGI server (uvloop + httptools when installed via uvicorn[standard])"""
     print(f"🌐 Stream server starting on http://localhost:{port}")
     print(f"📺 Web UI: http://localhost:{port}")
     print(f"📡 Stream: curl http://localhost:{port}/stream")
     print(f"📊 Events: curl http://localhost:{port}/events")
-    app.run(host='0.0.0.0', port=port, threaded=True, debug=False)
+    uvicorn.run(app, host='0.0.0.0', port=port, loop='auto', http='auto', workers=1)
 
 if __name__ == "__main__":
     run_server()
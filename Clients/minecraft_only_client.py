@@ -5,56 +5,110 @@ Narrates Minecraft gameplay events without screenshots (performance test branch)
 """
 
 import os
+import re
 import sys
+import shutil
+import tempfile
 import time
 import subprocess
 import platform
 import asyncio
+import atexit
+import logging
+import queue
 import threading
-import json
+import orjson
+import anyio
 import requests
+from requests.adapters import HTTPAdapter
 from pathlib import Path
+from collections import OrderedDict, deque
 from datetime import datetime
 from dotenv import load_dotenv
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
+from logging.handlers import QueueHandler, QueueListener
+
+try:
+    from watchfiles import awatch
+except ImportError:
+    awatch = None  # Fall back to polling the data file
+
+try:
+    import psutil
+except ImportError:
+    psutil = None  # Fall back to probing the receiver port
 
 load_dotenv()
 
+# Log through a queue so formatting and console writes happen on the listener thread, not the event loop
+log_queue = queue.Queue()
+log_listener = QueueListener(log_queue, logging.StreamHandler(sys.stdout))
+log_listener.start()
+atexit.register(log_listener.stop)  # Flushes queued records on exit
+logger = logging.getLogger("minecraft_narrator")
+logger.setLevel(logging.INFO)
+logger.addHandler(QueueHandler(log_queue))
+logger.propagate = False
+
 SCREENSHOT_DIR = Path(os.getenv("SCREENSHOT_DIR", "./screenshots"))
 SCREENSHOT_DIR.mkdir(exist_ok=True)
-MINECRAFT_DATA_FILE = SCREENSHOT_DIR / "minecraft_data.json"
-CHECK_INTERVAL = 2  # Check for new events every 2 seconds
+MINECRAFT_EVENTS_LOG = SCREENSHOT_DIR / "minecraft_events.ndjson"  # Appended to by the receiver
+RECEIVER_PID_FILE = SCREENSHOT_DIR / "receiver.pid"  # Written by the receiver while it runs
+CHECK_INTERVAL = 2  # Polling fallback: check for new events every 2 seconds
 
 # Configuration
 EXPLICIT = False  # Set to False for family-friendly mode
 MIN_BATCH_SIZE = 5  # Minimum events before generating narration
+MAX_BATCH_WAIT_SECONDS = 10  # ...unless the oldest queued event has waited this long
 
 # Cooldown audio paths
 COOLDOWN_AUDIO_EXPLICIT = Path("./Resources/CoolDownAudios/CoolDown_explicit.mp3")
 COOLDOWN_AUDIO_NICE = Path("./Resources/CoolDownAudios/CoolDown_nice.mp3")
+COOLDOWN_AUDIO = COOLDOWN_AUDIO_EXPLICIT if EXPLICIT else COOLDOWN_AUDIO_NICE
+COOLDOWN_AUDIO_READY = COOLDOWN_AUDIO.exists()  # Checked once, not on every rate limit
+
+# SFX keywords the narrator picks most often; their top results are downloaded in the background at startup
+COMMON_SFX_KEYWORDS = ["bruh", "laugh", "oof", "fail", "explosion"]
+PREFETCH_SFX_PER_KEYWORD = 3
 
 # SFX Cache directory
 SFX_CACHE_DIR = SCREENSHOT_DIR / "sfx_cache"
 SFX_CACHE_DIR.mkdir(exist_ok=True)
 
+SFX_DOWNLOAD_CHUNK = 64 * 1024  # Bytes written per chunk while streaming a download
+SFX_CACHE_MAX_BYTES = 200 * 1024 * 1024  # Evict least recently used SFX beyond this size
+SFX_STALE_PART_SECONDS = 10 * 60  # Older .part files are leftovers; newer ones may be another client's download
+
+# Preferred player: plays narration + SFX back to back from one process
+FFPLAY = shutil.which("ffplay")
+# Skip ffplay's input buffering and stream probing so audio starts sooner
+FFPLAY_LOW_LATENCY_FLAGS = ["-fflags", "nobuffer", "-flags", "low_delay", "-probesize", "32", "-analyzeduration", "0"]
+# Linux player, detected once (ffplay first so the low-latency flags apply)
+LINUX_PLAYER = next(filter(None, (shutil.which(player) for player in ["ffplay", "paplay", "mpg123", "aplay"])), None)
+
+# Persistent session so SFX downloads reuse TCP/TLS connections
+sfx_session = requests.Session()
+sfx_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
 # Global state for pipeline
-event_queue = []  # Raw events waiting to be narrated
-audio_queue = []  # Generated audio ready to play
-is_playing_audio = False
-is_generating_narration = False  # Singleton flag: only one generation at a time
-event_lock = threading.Lock()
-audio_lock = threading.Lock()
+# Each queue has a single consumer coroutine, so stages are serialized without locks or flags
+event_queue = asyncio.Queue()  # (event, recent events JSON snapshot, monotonic time queued) waiting to be narrated
+audio_queue = asyncio.Queue()  # Generated audio ready to play
 activity_history = []  # Last 2 activity modes for repetition detection
 MAX_ACTIVITY_HISTORY = 2
+recent_events = deque(maxlen=10)  # Mirrors the receiver's minecraft_data.json window
+
+# Filename sanitizing patterns, compiled once
+SANITIZE_STRIP = re.compile(r'[^\w\s-]')
+SANITIZE_WHITESPACE = re.compile(r'\s+')
 
 def sanitize_filename(title: str) -> str:
     """Convert SFX title to safe filename"""
-    import re
     # Remove special characters, keep alphanumeric and spaces
-    safe = re.sub(r'[^\w\s-]', '', title)
+    safe = SANITIZE_STRIP.sub('', title)
     # Replace spaces with underscores
-    safe = re.sub(r'\s+', '_', safe)
+    safe = SANITIZE_WHITESPACE.sub('_', safe)
     # Limit length
     return safe[:50].lower()
 
@@ -73,6 +127,41 @@ def calculate_activity_mode(events: list) -> str:
     
     return mode
 
+def load_sfx_index() -> OrderedDict:
+    """Index the SFX cache once at startup: filename -> size in bytes, least recently used first"""
+    files = []
+    stale_before = time.time() - SFX_STALE_PART_SECONDS
+    with os.scandir(SFX_CACHE_DIR) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            stat = entry.stat()
+            if entry.name.endswith(".part"):
+                # Leftover from an interrupted download; recent ones may still be in progress elsewhere
+                if stat.st_mtime < stale_before:
+                    Path(entry.path).unlink(missing_ok=True)
+                continue
+            files.append((stat.st_mtime, entry.name, stat.st_size))
+    files.sort()
+    return OrderedDict((name, size) for _, name, size in files)
+
+# Known cache contents, so lookups don't stat the disk
+sfx_index = load_sfx_index()
+sfx_index_lock = threading.Lock()  # download_sfx runs in worker threads
+sfx_download_locks = {}  # filename -> lock held while that SFX downloads, so concurrent callers share one download
+
+def add_to_sfx_index(cache_filename: str, size: int):
+    """Record a newly cached SFX and evict the least recently used ones beyond SFX_CACHE_MAX_BYTES"""
+    with sfx_index_lock:
+        sfx_index[cache_filename] = size
+        sfx_index.move_to_end(cache_filename)
+        total = sum(sfx_index.values())
+        while total > SFX_CACHE_MAX_BYTES and len(sfx_index) > 1:
+            old_name, old_size = sfx_index.popitem(last=False)
+            (SFX_CACHE_DIR / old_name).unlink(missing_ok=True)
+            total -= old_size
+            logger.info(f"🗑️  Evicted cached SFX: {old_name}")
+
 def download_sfx(mp3_url: str, title: str) -> Path:
     """
     Download sound effect from URL with caching.
@@ -84,23 +173,38 @@ def download_sfx(mp3_url: str, title: str) -> Path:
     cache_filename = f"{sanitize_filename(title)}.mp3"
     sfx_path = SFX_CACHE_DIR / cache_filename
     
-    # Check if already cached
-    if sfx_path.exists():
-        print(f"✅ Using cached SFX: {cache_filename}")
-        return sfx_path
+    with sfx_index_lock:
+        download_lock = sfx_download_locks.setdefault(cache_filename, threading.Lock())
     
-    # Download if not cached
-    try:
-        print(f"📥 Downloading new SFX: {title}")
-        response = requests.get(mp3_url, timeout=10)
-        response.raise_for_status()
-        with open(sfx_path, 'wb') as f:
-            f.write(response.content)
-        print(f"💾 Cached SFX: {cache_filename}")
-        return sfx_path
-    except Exception as e:
-        print(f"⚠️  Failed to download SFX: {e}")
-        return None
+    # Startup prefetch and the pipeline can ask for the same SFX at once; the second waits for the first
+    with download_lock:
+        # Check if already cached
+        with sfx_index_lock:
+            if cache_filename in sfx_index:
+                sfx_index.move_to_end(cache_filename)
+                logger.info(f"✅ Using cached SFX: {cache_filename}")
+                return sfx_path
+        
+        # Download if not cached
+        # Stream to a uniquely named .part file and rename, so a failed download never leaves a truncated cache entry
+        part_path = None
+        try:
+            logger.info(f"📥 Downloading new SFX: {title}")
+            with sfx_session.get(mp3_url, timeout=10, stream=True) as response:
+                response.raise_for_status()
+                with tempfile.NamedTemporaryFile(dir=SFX_CACHE_DIR, suffix=".part", delete=False) as f:
+                    part_path = Path(f.name)
+                    for chunk in response.iter_content(chunk_size=SFX_DOWNLOAD_CHUNK):
+                        f.write(chunk)
+            os.replace(part_path, sfx_path)
+            add_to_sfx_index(cache_filename, sfx_path.stat().st_size)
+            logger.info(f"💾 Cached SFX: {cache_filename}")
+            return sfx_path
+        except Exception as e:
+            logger.warning(f"⚠️  Failed to download SFX: {e}")
+            if part_path:
+                part_path.unlink(missing_ok=True)
+            return None
 
 def play_audio(audio_file: Path, max_duration: float = None):
     """Play audio file (cross-platform, no window on Windows)
@@ -112,7 +216,7 @@ def play_audio(audio_file: Path, max_duration: float = None):
     if not audio_file.exists():
         return
     
-    print(f"🔊 Playing audio: {audio_file}")
+    logger.info(f"🔊 Playing audio: {audio_file}")
     system = platform.system()
     
     if system == "Darwin":  # macOS
@@ -123,13 +227,13 @@ def play_audio(audio_file: Path, max_duration: float = None):
             except subprocess.TimeoutExpired:
                 process.kill()
                 process.wait()
-                print(f"⏱️  Audio cut off after {max_duration}s")
+                logger.info(f"⏱️  Audio cut off after {max_duration}s")
         else:
             process.wait()
     elif system == "Windows":
         # Use ffplay with duration limit (hidden window)
         try:
-            cmd = ["ffplay", "-nodisp", "-autoexit", str(audio_file)]
+            cmd = ["ffplay", "-nodisp", "-autoexit", *FFPLAY_LOW_LATENCY_FLAGS, str(audio_file)]
             if max_duration:
                 cmd.extend(["-t", str(max_duration)])
             
@@ -146,7 +250,7 @@ def play_audio(audio_file: Path, max_duration: float = None):
                 except subprocess.TimeoutExpired:
                     process.kill()
                     process.wait()
-                    print(f"⏱️  Audio cut off after {max_duration}s")
+                    logger.info(f"⏱️  Audio cut off after {max_duration}s")
             else:
                 process.wait()
         except FileNotFoundError:
@@ -162,138 +266,206 @@ def play_audio(audio_file: Path, max_duration: float = None):
                     f"Start-Sleep -Seconds {int(max_duration) if max_duration else '([int]($mediaPlayer.NaturalDuration.TimeSpan.TotalSeconds + 1))'}"
                 ], check=True, creationflags=subprocess.CREATE_NO_WINDOW, timeout=max_duration + 1 if max_duration else None)
             except:
-                print("⚠️  Could not play audio")
+                logger.warning("⚠️  Could not play audio")
     else:  # Linux
-        # Try various Linux audio players
-        for player in ["paplay", "mpg123", "ffplay", "aplay"]:
+        if not LINUX_PLAYER:
+            logger.warning("⚠️  No audio player found (install ffplay, paplay, mpg123 or aplay)")
+            return
+        
+        cmd = [LINUX_PLAYER, str(audio_file)]
+        if LINUX_PLAYER == FFPLAY:
+            cmd = [LINUX_PLAYER, "-nodisp", "-autoexit", *FFPLAY_LOW_LATENCY_FLAGS, str(audio_file)]
+        process = subprocess.Popen(cmd, 
+                                  stdout=subprocess.DEVNULL, 
+                                  stderr=subprocess.DEVNULL)
+        if max_duration:
             try:
-                process = subprocess.Popen([player, str(audio_file)], 
-                                          stdout=subprocess.DEVNULL, 
-                                          stderr=subprocess.DEVNULL)
-                if max_duration:
-                    try:
-                        process.wait(timeout=max_duration)
-                    except subprocess.TimeoutExpired:
-                        process.kill()
-                        process.wait()
-                        print(f"⏱️  Audio cut off after {max_duration}s")
-                else:
-                    process.wait()
-                break
-            except FileNotFoundError:
-                continue
+                process.wait(timeout=max_duration)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+                logger.info(f"⏱️  Audio cut off after {max_duration}s")
+        else:
+            process.wait()
 
-async def generate_audio_file(batch_narrations):
-    """Generate audio file from narrations"""
-    python_cmd = "python" if platform.system() == "Windows" else "python3"
+def play_audio_sequence(clips: list):
+    """Play clips back to back in one ffplay process (ffconcat playlist on stdin).
+    Falls back to one play_audio call per clip when ffplay isn't installed.
+    
+    Args:
+        clips: List of (audio_file, max_duration) tuples; max_duration None = full file
+    """
+    clips = [(audio_file, max_duration) for audio_file, max_duration in clips if audio_file.exists()]
+    if not clips:
+        return
     
-    server_params = StdioServerParameters(
+    if not FFPLAY:
+        for audio_file, max_duration in clips:
+            play_audio(audio_file, max_duration)
+        return
+    
+    playlist = ["ffconcat version 1.0"]
+    for audio_file, max_duration in clips:
+        escaped = str(audio_file.absolute()).replace("'", "'\\''")
+        playlist.append(f"file '{escaped}'")
+        if max_duration:
+            playlist.append(f"outpoint {max_duration}")
+    
+    logger.info(f"🔊 Playing audio: {', '.join(audio_file.name for audio_file, _ in clips)}")
+    cmd = [FFPLAY, "-nodisp", "-autoexit", "-loglevel", "quiet", *FFPLAY_LOW_LATENCY_FLAGS,
+           "-f", "concat", "-safe", "0", "-protocol_whitelist", "file,pipe", "-i", "pipe:0"]
+    extra = {"creationflags": subprocess.CREATE_NO_WINDOW} if platform.system() == "Windows" else {}
+    process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL, **extra)
+    # Closing stdin ends the playlist; ffplay exits after the last clip (-autoexit)
+    process.communicate(("\n".join(playlist) + "\n").encode())
+
+async def fetch_sfx(sfx_info):
+    """Download/cache the selected SFX without blocking the event loop; None if there is none"""
+    if not sfx_info:
+        return None
+    
+    sfx_path = await asyncio.to_thread(download_sfx, sfx_info['mp3'], sfx_info['title'])
+    if sfx_path:
+        logger.info(f"✅ SFX downloaded: {sfx_path}")
+    else:
+        logger.error(f"❌ SFX download failed")
+    return sfx_path
+
+def get_server_params():
+    """MCP server launch parameters for the narrator session"""
+    python_cmd = "python" if platform.system() == "Windows" else "python3"
+    return StdioServerParameters(
         command=python_cmd,
         args=["../mcp_server.py"],
-        env={
-            **os.environ,
-            "SCREENSHOT_DIR": str(SCREENSHOT_DIR),
-        }
+        env={**os.environ, "SCREENSHOT_DIR": str(SCREENSHOT_DIR)}
     )
-    
+
+def is_session_closed(error):
+    """True if the error means the MCP server connection is gone and the session must be reopened"""
+    if isinstance(error, (BrokenPipeError, ConnectionError, anyio.ClosedResourceError, anyio.BrokenResourceError)):
+        return True
+    return "Connection closed" in str(error)
+
+async def generate_audio_file(session, batch_narrations):
+    """Generate audio file from narrations"""
     try:
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-                
-                # Summarize all narrations into one
-                result = await session.call_tool("summarize_narrations", {
-                    "narrations": batch_narrations
-                })
-                summarized_text = result.content[0].text
-                print(f"📝 Summary: {summarized_text}")
-                
-                audio_filename = f"narration_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp3"
-                result = await session.call_tool("tts", {
-                    "text": summarized_text,
-                    "output_file": audio_filename
-                })
-                
-                return SCREENSHOT_DIR / audio_filename
+        # Summarize all narrations into one
+        result = await session.call_tool("summarize_narrations", {
+            "narrations": batch_narrations
+        })
+        summarized_text = result.content[0].text
+        logger.info(f"📝 Summary: {summarized_text}")
+        
+        audio_filename = f"narration_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp3"
+        result = await session.call_tool("tts", {
+            "text": summarized_text,
+            "output_file": audio_filename
+        })
+        
+        return SCREENSHOT_DIR / audio_filename
     except KeyboardInterrupt:
         raise
     except Exception as e:
         # Suppress process termination errors - they're expected during cleanup
         error_str = str(e)
         if not any(x in error_str for x in ["Process group termination", "TaskGroup", "Operation not permitted"]):
-            print(f"❌ Error generating audio: {e}")
+            logger.error(f"❌ Error generating audio: {e}")
         return None
 
-async def minecraft_event_loop():
-    """Monitor Minecraft events and add them to event queue"""
-    last_timestamp = None
+def read_new_events(file_pos):
+    """Read events appended to the event log since file_pos; returns (events, new file_pos)"""
+    try:
+        size = MINECRAFT_EVENTS_LOG.stat().st_size
+    except FileNotFoundError:
+        return [], 0
     
-    while True:
-        # Check if Minecraft data file exists and has new events
-        if MINECRAFT_DATA_FILE.exists():
+    if size == file_pos:
+        # Nothing appended - skip opening the file (one stat per poll)
+        return [], file_pos
+    if size < file_pos:
+        # Log shrank (receiver restarted or events cleared) - start over
+        file_pos = 0
+    
+    events = []
+    with open(MINECRAFT_EVENTS_LOG, 'rb') as f:
+        f.seek(file_pos)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # Partially written line - pick it up on the next read
+            file_pos += len(line)
             try:
-                with open(MINECRAFT_DATA_FILE, 'r') as f:
-                    import json
-                    events = json.load(f)
-                
-                if not events:
-                    # Reset timestamp when events are empty - stay silent
-                    last_timestamp = None
-                    await asyncio.sleep(CHECK_INTERVAL)
-                    continue
-                
-                # Get the most recent event timestamp
-                latest_event = events[-1]  # Last event is newest
-                current_timestamp = latest_event.get('timestamp')
-                
-                # If timestamp changed, add event to queue (don't generate yet)
-                if current_timestamp != last_timestamp:
-                    print(f"🎮 New event: {latest_event.get('event_type')} - {latest_event.get('event_source')}")
-                    
-                    with event_lock:
-                        event_queue.append(latest_event)
-                    
-                    last_timestamp = current_timestamp
-                        
-            except Exception as e:
-                print(f"⚠️  Error reading events: {e}")
-        else:
-            # Reset timestamp if file doesn't exist
-            last_timestamp = None
-        
-        await asyncio.sleep(CHECK_INTERVAL)
+                events.append(orjson.loads(line))
+            except orjson.JSONDecodeError as e:
+                logger.warning(f"⚠️  Skipping bad event line: {e}")
+    return events, file_pos
 
-async def generate_audio_pipeline():
-    """Pipeline: Batch events and generate audio while previous audio plays"""
-    global is_generating_narration
+async def check_minecraft_data(file_pos):
+    """Queue events appended since file_pos; returns the new file position"""
+    try:
+        events, file_pos = read_new_events(file_pos)
+    except OSError as e:
+        logger.warning(f"⚠️  Error reading events: {e}")
+        return file_pos
     
+    for event in events:
+        # Hot path: lazy %-formatting so nothing is formatted if the level is filtered out
+        logger.info("🎮 New event: %s - %s", event.get('event_type'), event.get('event_source'))
+        # Snapshot the recent events now so the generator never has to reopen the data file
+        recent_events.append(event)
+        await event_queue.put((event, orjson.dumps(list(recent_events)).decode(), time.monotonic()))
+    return file_pos
+
+async def minecraft_event_loop():
+    """Monitor Minecraft events and add them to event queue"""
+    # Only narrate events that arrive after startup
+    file_pos = MINECRAFT_EVENTS_LOG.stat().st_size if MINECRAFT_EVENTS_LOG.exists() else 0
+    
+    if awatch is None:
+        logger.warning(f"⚠️  watchfiles not installed - polling for events every {CHECK_INTERVAL}s")
+        while True:
+            await asyncio.sleep(CHECK_INTERVAL)
+            file_pos = await check_minecraft_data(file_pos)
+    
+    # Only wake up when the receiver actually appends to the event log
+    # (match by name: awatch reports paths in its own form, which may not equal ours if SCREENSHOT_DIR has symlinks)
+    events_log_name = MINECRAFT_EVENTS_LOG.name
+    async for changes in awatch(SCREENSHOT_DIR, recursive=False):
+        if any(Path(path).name == events_log_name for _, path in changes):
+            file_pos = await check_minecraft_data(file_pos)
+
+async def generate_audio_pipeline(session):
+    """
+    Pipeline: Batch events and generate audio while previous audio plays.
+    Returns if the MCP server connection is lost so the caller can reopen the session.
+    """
     while True:
-        # Wait if not enough events OR already generating (singleton)
-        current_queue_size = len(event_queue)
-        if current_queue_size < MIN_BATCH_SIZE:
-            if current_queue_size > 0:
-                print(f"⏳ Waiting for more events ({current_queue_size}/{MIN_BATCH_SIZE})...")
-            await asyncio.sleep(0.5)
-            continue
-        
-        if is_generating_narration:
-            await asyncio.sleep(0.5)
-            continue
-        
-        # Set singleton flag - only one generation at a time
-        is_generating_narration = True
+        # Block until a full batch has arrived or the oldest event has waited MAX_BATCH_WAIT_SECONDS
+        # since it was queued (events keep queueing while we generate and play)
+        event, minecraft_data, queued_at = await event_queue.get()
+        batch_events = [event]
+        deadline = queued_at + MAX_BATCH_WAIT_SECONDS
+        while len(batch_events) < MIN_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            logger.info(f"⏳ Waiting for more events ({len(batch_events)}/{MIN_BATCH_SIZE})...")
+            try:
+                event, minecraft_data, _ = await asyncio.wait_for(event_queue.get(), timeout=remaining)
+            except asyncio.TimeoutError:
+                logger.info(f"⌛ Oldest event waited {MAX_BATCH_WAIT_SECONDS}s - narrating a partial batch")
+                break
+            batch_events.append(event)
         
-        # Get ALL queued events and generate ONE narration from them
-        with event_lock:
-            if len(event_queue) < MIN_BATCH_SIZE:
-                is_generating_narration = False
-                continue
-            batch_events = event_queue.copy()
-            event_queue.clear()
+        # Take ALL queued events and generate ONE narration from them
+        # (minecraft_data ends up as the snapshot taken with the newest event)
+        while not event_queue.empty():
+            event, minecraft_data, _ = event_queue.get_nowait()
+            batch_events.append(event)
         
         # Calculate activity mode (most common event type)
         activity_mode = calculate_activity_mode(batch_events)
-        print(f"📈 Calculated activity mode from {len(batch_events)} events: '{activity_mode}'")
+        logger.info(f"📈 Calculated activity mode from {len(batch_events)} events: '{activity_mode}'")
         
         # Check for repetition
         is_repetitive = len(activity_history) >= 2 and activity_history[-1] == activity_history[-2] == activity_mode
@@ -302,178 +474,170 @@ async def generate_audio_pipeline():
         activity_history.append(activity_mode)
         if len(activity_history) > MAX_ACTIVITY_HISTORY:
             removed = activity_history.pop(0)
-            print(f"📤 Removed old activity from history: '{removed}'")
+            logger.info(f"📤 Removed old activity from history: '{removed}'")
         
-        print(f"�  Saved activity to history: '{activity_mode}'")
+        logger.info(f"�  Saved activity to history: '{activity_mode}'")
         
-        print(f"\n{'='*50}")
-        print(f"🎤 Generating narration for {len(batch_events)} event(s)...")
-        print(f"📊 Current activity: {activity_mode} | Full history: {activity_history}")
+        logger.info(f"\n{'='*50}")
+        logger.info(f"🎤 Generating narration for {len(batch_events)} event(s)...")
+        logger.info(f"📊 Current activity: {activity_mode} | Full history: {activity_history}")
         if is_repetitive:
-            print(f"🔁 REPETITION DETECTED! Player keeps doing: {activity_mode}")
-        print(f"{'='*50}")
-        
-        # Generate single narration from all batched events
-        python_cmd = "python" if platform.system() == "Windows" else "python3"
-        server_params = StdioServerParameters(
-            command=python_cmd,
-            args=["../mcp_server.py"],
-            env={**os.environ, "SCREENSHOT_DIR": str(SCREENSHOT_DIR)}
-        )
+            logger.info(f"🔁 REPETITION DETECTED! Player keeps doing: {activity_mode}")
+        logger.info(f"{'='*50}")
         
         rate_limited = False
         
         try:
-            async with stdio_client(server_params) as (read, write):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    
-                    # Load current Minecraft data
-                    with open(MINECRAFT_DATA_FILE, 'r') as f:
-                        minecraft_data = f.read()
-                    
-                    await session.call_tool("get_minecraft_input", {"minecraft_data": minecraft_data})
-                    
-                    # Generate ONE narration for all events
-                    result = await session.call_tool("describe_for_narration", {
-                        "image_count": 0,
-                        "include_minecraft": True,
-                        "is_repetitive": is_repetitive,
-                        "activity_mode": activity_mode,
-                        "explicit": EXPLICIT
-                    })
-                    
-                    raw_response = result.content[0].text
-                    print(f"🔍 Raw MCP response: {raw_response[:200]}...")
-                    
-                    response_data = json.loads(raw_response)
-                    print(f"📦 Parsed response keys: {list(response_data.keys())}")
-                    
-                    narration = response_data["narration"]
-                    sfx_info = response_data.get("sfx")
-                    
-                    # Check for rate limit in narration response
-                    if "429" in narration or "quota exceeded" in narration.lower() or "rate limit" in narration.lower():
-                        print("⏱️  Rate limit detected - playing cooldown audio")
-                        rate_limited = True
-                    else:
-                        print(f"📝 Narration: {narration[:80]}...")
-                        if sfx_info:
-                            print(f"🎵 SFX selected: {sfx_info['title']} (query: {sfx_info.get('query', 'N/A')})")
-                        else:
-                            print(f"⚠️  No SFX info in response")
-                        
-                        # Generate audio
-                        audio_filename = f"narration_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp3"
-                        tts_result = await session.call_tool("tts", {"text": narration, "output_file": audio_filename})
-                        print(f"🎙️  TTS result: {tts_result.content[0].text if tts_result.content else 'No response'}")
-                        
-                        audio_path = SCREENSHOT_DIR / audio_filename
-                        
-                        # Wait a moment for file to be written
-                        await asyncio.sleep(0.5)
-                        
-                        # Download/cache SFX
-                        sfx_path = None
-                        if sfx_info:
-                            sfx_path = download_sfx(sfx_info['mp3'], sfx_info['title'])
-                            if sfx_path:
-                                print(f"✅ SFX downloaded: {sfx_path}")
-                            else:
-                                print(f"❌ SFX download failed")
-                        
-                        # Add to audio queue
-                        if audio_path.exists():
-                            with audio_lock:
-                                audio_queue.append({"audio_path": audio_path, "sfx_path": sfx_path})
-                            print(f"✅ Audio ready ({len(audio_queue)} in queue)")
-                        else:
-                            print(f"⚠️  Audio file not found: {audio_path}")
-                    
+            # Store the events and generate ONE narration for all of them in a single round trip
+            # (TTS stays a separate call so it can overlap with the SFX download)
+            result = await session.call_tool("process_batch", {
+                "minecraft_data": minecraft_data,
+                "is_repetitive": is_repetitive,
+                "activity_mode": activity_mode,
+                "explicit": EXPLICIT
+            })
+            
+            raw_response = result.content[0].text
+            logger.info(f"🔍 Raw MCP response: {raw_response[:200]}...")
+            
+            response_data = orjson.loads(raw_response)
+            logger.info(f"📦 Parsed response keys: {list(response_data.keys())}")
+            
+            narration = response_data["narration"]
+            sfx_info = response_data.get("sfx")
+            
+            # Check for rate limit in narration response
+            if "429" in narration or "quota exceeded" in narration.lower() or "rate limit" in narration.lower():
+                logger.info("⏱️  Rate limit detected - playing cooldown audio")
+                rate_limited = True
+            else:
+                logger.info(f"📝 Narration: {narration[:80]}...")
+                if sfx_info:
+                    logger.info(f"🎵 SFX selected: {sfx_info['title']} (query: {sfx_info.get('query', 'N/A')})")
+                else:
+                    logger.warning(f"⚠️  No SFX info in response")
+                
+                # Generate audio while the SFX downloads - the two are independent
+                audio_filename = f"narration_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp3"
+                tts_result, sfx_path = await asyncio.gather(
+                    session.call_tool("tts", {"text": narration, "output_file": audio_filename}),
+                    fetch_sfx(sfx_info)
+                )
+                # The tts tool returns after the file is fully written
+                logger.info(f"🎙️  TTS result: {tts_result.content[0].text if tts_result.content else 'No response'}")
+                
+                audio_path = SCREENSHOT_DIR / audio_filename
+                
+                # Add to audio queue
+                if audio_path.exists():
+                    await audio_queue.put({"audio_path": audio_path, "sfx_path": sfx_path})
+                    logger.info(f"✅ Audio ready ({audio_queue.qsize()} in queue)")
+                else:
+                    logger.warning(f"⚠️  Audio file not found: {audio_path}")
+            
         except Exception as e:
+            if is_session_closed(e):
+                logger.info(f"🔌 MCP server connection lost: {e}")
+                return
             error_str = str(e)
             # Check if it's a rate limit error
             if "429" in error_str or "quota exceeded" in error_str.lower() or "rate limit" in error_str.lower():
-                print("⏱️  Rate limit detected - playing cooldown audio")
+                logger.info("⏱️  Rate limit detected - playing cooldown audio")
                 rate_limited = True
             # Suppress expected cleanup errors
             elif any(x in error_str for x in ["Process group termination", "TaskGroup", "Operation not permitted"]):
                 pass  # Expected during cleanup, ignore silently
             else:
-                print(f"❌ Error: {e}")
+                logger.error(f"❌ Error: {e}")
         
         # Play cooldown audio if rate limited
         if rate_limited:
-            cooldown_audio = COOLDOWN_AUDIO_EXPLICIT if EXPLICIT else COOLDOWN_AUDIO_NICE
-            if cooldown_audio.exists():
-                with audio_lock:
-                    audio_queue.append({"audio_path": cooldown_audio, "sfx_path": None})
-                print(f"🔊 Cooldown audio queued")
+            if COOLDOWN_AUDIO_READY:
+                await audio_queue.put({"audio_path": COOLDOWN_AUDIO, "sfx_path": None})
+                logger.info(f"🔊 Cooldown audio queued")
             else:
-                print(f"⚠️  Cooldown audio not found: {cooldown_audio}")
-        
-        # Release singleton flag
-        is_generating_narration = False
+                logger.warning(f"⚠️  Cooldown audio not found: {COOLDOWN_AUDIO}")
+
+async def prefetch_common_sfx(session):
+    """Download the likeliest SFX during idle time so the first narrations don't wait on them"""
+    for keyword in COMMON_SFX_KEYWORDS:
+        try:
+            result = await session.call_tool("get_sfx", {"query": keyword, "limit": PREFETCH_SFX_PER_KEYWORD})
+            text = result.content[0].text if result.content else ""
+            if not text.startswith("["):
+                continue  # No results or search error
+            for sfx in orjson.loads(text):
+                if sfx.get("mp3"):
+                    await asyncio.to_thread(download_sfx, sfx["mp3"], sfx["title"])
+        except Exception as e:
+            logger.warning(f"⚠️  SFX prefetch stopped: {e}")
+            return
+    logger.info(f"✅ Prefetched common SFX ({', '.join(COMMON_SFX_KEYWORDS)})")
+
+async def session_generate_pipeline():
+    """Stage 2 on one long-lived MCP server session, reopened if the server goes away"""
+    prefetch_task = None
+    while True:
+        async with stdio_client(get_server_params()) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                logger.info("🔌 MCP server session ready")
+                if prefetch_task is None:
+                    prefetch_task = asyncio.create_task(prefetch_common_sfx(session))
+                await generate_audio_pipeline(session)
+        logger.info("🔌 Reopening MCP server session...")
 
 async def play_audio_pipeline():
     """Pipeline: Play audio as soon as it's ready"""
-    global is_playing_audio
-    
-    print("🎧 Audio playback pipeline started")
+    logger.info("🎧 Audio playback pipeline started")
     
     while True:
-        # Wait if no audio ready OR currently playing
-        if not audio_queue:
-            await asyncio.sleep(0.5)
-            continue
-        
-        if is_playing_audio:
-            print(f"⏸️  Waiting for current playback to finish...")
-            await asyncio.sleep(0.5)
-            continue
-        
-        print(f"🎵 Audio queue has {len(audio_queue)} item(s), is_playing={is_playing_audio}")
-        
-        # Get next audio to play
-        with audio_lock:
-            if not audio_queue:
-                continue
-            audio_item = audio_queue.pop(0)
+        # Wake as soon as audio is queued; clips play one at a time since this is the only consumer
+        audio_item = await audio_queue.get()
         
         audio_path = audio_item["audio_path"]
         sfx_path = audio_item["sfx_path"]
         
-        print(f"🎬 Playing: narration={audio_path.name}, sfx={sfx_path.name if sfx_path else 'None'}")
-        
-        is_playing_audio = True
-        print(f"🔒 Playback lock acquired (is_playing={is_playing_audio})")
+        logger.info(f"🎬 Playing: narration={audio_path.name}, sfx={sfx_path.name if sfx_path else 'None'} ({audio_queue.qsize()} more queued)")
         
         try:
-            # Play narration first, then SFX
-            print(f"🎵 Playing narration...")
-            await asyncio.to_thread(play_audio, audio_path)
-            
-            # Then play sound effect after narration finishes (max 5 seconds)
+            # Play narration first, then sound effect after narration finishes (max 5 seconds)
+            clips = [(audio_path, None)]
             if sfx_path:
                 if sfx_path.exists():
-                    print(f"🎵 Playing sound effect: {sfx_path.name} (max 5s)...")
-                    await asyncio.to_thread(play_audio, sfx_path, 5.0)
+                    logger.info(f"🎵 Playing narration + sound effect: {sfx_path.name} (max 5s)...")
+                    clips.append((sfx_path, 5.0))
                 else:
-                    print(f"⚠️  SFX file not found: {sfx_path}")
+                    logger.warning(f"⚠️  SFX file not found: {sfx_path}")
             else:
-                print(f"ℹ️  No SFX for this narration")
+                logger.info(f"ℹ️  No SFX for this narration")
             
-            print(f"✅ Audio playback completed")
+            await asyncio.to_thread(play_audio_sequence, clips)
+            
+            logger.info(f"✅ Audio playback completed")
         except Exception as e:
-            print(f"❌ Error playing audio: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"❌ Error playing audio: {e}")
         finally:
-            # Small delay to ensure audio is fully finished
-            await asyncio.sleep(0.3)
-            is_playing_audio = False
-            print(f"🔓 Playback lock released (is_playing={is_playing_audio})")
-            print(f"{'='*50}\n")
+            # Playback helpers return only after the player process exits, so the next clip can start right away
+            logger.info(f"{'='*50}\n")
+
+def port_open(port: int) -> bool:
+    """Quick localhost probe, bounded to 50ms so a closed port never stalls startup"""
+    import socket
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.settimeout(0.05)
+        return sock.connect_ex(('localhost', port)) == 0
+
+def receiver_running() -> bool:
+    """True if a Minecraft receiver is already running: its pidfile names a live process and port 8080 answers"""
+    if psutil is not None:
+        # A stale pidfile (receiver killed, pid reused) is caught by the port probe below
+        try:
+            if not psutil.pid_exists(int(RECEIVER_PID_FILE.read_text())):
+                return False
+        except (FileNotFoundError, ValueError):
+            return False
+    return port_open(8080)
 
 def start_minecraft_receiver():
     """Start the Minecraft receiver server in background"""
@@ -481,13 +645,8 @@ def start_minecraft_receiver():
     
     try:
         # Check if receiver is already running
-        import socket
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        result = sock.connect_ex(('localhost', 8080))
-        sock.close()
-        
-        if result == 0:
-            print("🎮 Minecraft receiver already running on port 8080")
+        if receiver_running():
+            logger.info("🎮 Minecraft receiver already running on port 8080")
             return None
         
         # Start receiver in background
@@ -496,40 +655,47 @@ def start_minecraft_receiver():
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL
         )
-        time.sleep(1)
-        print("🎮 Minecraft receiver started on port 8080")
+        # Wait until it is listening (at most ~1s) instead of always sleeping a full second
+        for _ in range(20):
+            if port_open(8080):
+                break
+            time.sleep(0.05)
+        logger.info("🎮 Minecraft receiver started on port 8080")
         return receiver_process
     except Exception as e:
-        print(f"⚠️  Could not start Minecraft receiver: {e}")
+        logger.warning(f"⚠️  Could not start Minecraft receiver: {e}")
         return None
 
 async def main():
     """Main entry point"""
-    print("🚀 Minecraft-Only Narrator Started (Performance Test)")
-    print(f"📁 Data directory: {SCREENSHOT_DIR}")
-    print(f"⏱️  Checking for Minecraft events every {CHECK_INTERVAL} seconds")
-    print("📝 No screenshots - Minecraft events only!")
-    print("\n🎵 Sound Effects: MyInstants API (https://github.com/abdipr/myinstants-api)")
-    print("   Sounds from MyInstants.com - Used with attribution")
+    logger.info("🚀 Minecraft-Only Narrator Started (Performance Test)")
+    logger.info(f"📁 Data directory: {SCREENSHOT_DIR}")
+    logger.info(f"⏱️  Watching for Minecraft events in {MINECRAFT_EVENTS_LOG}")
+    logger.info("📝 No screenshots - Minecraft events only!")
+    logger.info("\n🎵 Sound Effects: MyInstants API (https://github.com/abdipr/myinstants-api)")
+    logger.info("   Sounds from MyInstants.com - Used with attribution")
+    
+    if not COOLDOWN_AUDIO_READY:
+        logger.warning(f"⚠️  Cooldown audio not found: {COOLDOWN_AUDIO} (rate limits will be silent)")
     
     # Start Minecraft receiver automatically
     receiver_process = start_minecraft_receiver()
     
-    print("\nPress Ctrl+C to stop\n")
+    logger.info("\nPress Ctrl+C to stop\n")
     
     try:
         # Run all pipeline stages concurrently
         await asyncio.gather(
             minecraft_event_loop(),      # Stage 1: Detect & batch events
-            generate_audio_pipeline(),   # Stage 2: Generate audio
+            session_generate_pipeline(), # Stage 2: Generate audio (persistent MCP session)
             play_audio_pipeline()        # Stage 3: Play audio
         )
     except KeyboardInterrupt:
-        print("\n\n👋 Stopping Minecraft narrator...")
+        logger.info("\n\n👋 Stopping Minecraft narrator...")
         
         # Stop Minecraft receiver if we started it
         if receiver_process:
-            print("🛑 Stopping Minecraft receiver...")
+            logger.info("🛑 Stopping Minecraft receiver...")
             receiver_process.terminate()
             receiver_process.wait()
 
@@ -7,75 +7,147 @@ Processes descriptions in background while audio plays
 
 import os
 import sys
+import socket
+import hashlib
+import threading
 import time
 import subprocess
 import platform
 import asyncio
-import threading
-import json
+import orjson
+import anyio
 import requests
+from requests.adapters import HTTPAdapter
 from pathlib import Path
 from datetime import datetime
 from dotenv import load_dotenv
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
-from PIL import ImageGrab
+from PIL import Image, ImageGrab
+
+try:
+    import mss
+except ImportError:
+    mss = None  # Fall back to PIL ImageGrab
 
 load_dotenv()
 
 SCREENSHOT_DIR = Path(os.getenv("SCREENSHOT_DIR", "./screenshots"))
 SCREENSHOT_DIR.mkdir(exist_ok=True)
+MINECRAFT_DATA_FILE = SCREENSHOT_DIR / "minecraft_data.json"
+RECEIVER_PORT = 8080
 INTERVAL = 10  # seconds
+# SFX cache directory (shared with the Minecraft client; files here are named by URL hash)
+SFX_CACHE_DIR = SCREENSHOT_DIR / "sfx_cache"
+SFX_CACHE_DIR.mkdir(exist_ok=True)
+JPEG_QUALITY = 85  # JPEG encodes several times faster than PNG deflate; the server downscales to JPEG anyway
+MAX_SCREENSHOT_SIZE = (1280, 720)  # The vision model sees far less than full resolution; the server shrinks to 768px anyway
 
 # Global state for batching narrations
-narration_queue = []
-is_playing_audio = False
-queue_lock = threading.Lock()
+MAX_QUEUED_NARRATIONS = 4  # Older narrations are dropped - the narrator should describe what's happening now
+narration_queue = asyncio.Queue(maxsize=MAX_QUEUED_NARRATIONS)  # Narrations waiting to be summarized and played
+session_lost = asyncio.Event()  # Set when the MCP server connection drops so main can reopen it
+narration_tasks = set()  # In-flight generate_narration tasks, awaited before a session is replaced
+sfx_cache = {}  # mp3 URL -> cached file, so repeated SFX skip the disk check too
+minecraft_data_cache = (None, None, None)  # (mtime_ns, contents, content digest) of the Minecraft data file
+sent_minecraft_digest = None  # Content digest of the Minecraft data last sent to the server
+
+# Skip ffplay's input buffering and stream probing so audio starts sooner
+FFPLAY_LOW_LATENCY_FLAGS = ["-fflags", "nobuffer", "-flags", "low_delay", "-probesize", "32", "-analyzeduration", "0"]
+
+# Persistent session so SFX downloads reuse TCP/TLS connections
+sfx_session = requests.Session()
+sfx_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+# mss captures on Windows/Linux. Its native handles (display / device context) are thread-local,
+# so each capture thread builds its own grabber once and reuses it; creating one per shot costs more than the grab
+USE_MSS = mss is not None and platform.system() != "Darwin"
+grabber_local = threading.local()
+
+def get_screen_grabber():
+    """This thread's mss grabber, created on first use"""
+    grabber = getattr(grabber_local, "grabber", None)
+    if grabber is None:
+        grabber = grabber_local.grabber = mss.mss()
+    return grabber
+
+def save_screenshot(screenshot: Image.Image, filename: Path):
+    """Downscale to MAX_SCREENSHOT_SIZE and save as JPEG"""
+    screenshot = screenshot.convert("RGB")
+    screenshot.thumbnail(MAX_SCREENSHOT_SIZE, Image.Resampling.BILINEAR)
+    screenshot.save(filename, "JPEG", quality=JPEG_QUALITY)
+
+def grab_screen(filename: Path):
+    """Capture all monitors to filename with mss (BitBlt/XGetImage, no extra PIL copy)"""
+    screen_grabber = get_screen_grabber()
+    shot = screen_grabber.grab(screen_grabber.monitors[0])
+    # Decode straight from mss's raw BGRA buffer; shot.rgb would build a second full-frame copy first
+    save_screenshot(Image.frombytes("RGB", shot.size, shot.bgra, "raw", "BGRX"), filename)
 
 def take_screenshot():
     """Take a screenshot and save to directory (cross-platform)"""
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = SCREENSHOT_DIR / f"screenshot_{timestamp}.png"
+    filename = SCREENSHOT_DIR / f"screenshot_{timestamp}.jpg"
     
     system = platform.system()
     
     if system == "Darwin":  # macOS
-        subprocess.run(["screencapture", "-x", str(filename)], check=True)
+        subprocess.run(["screencapture", "-x", "-t", "jpg", str(filename)], check=True)
     elif system == "Windows":
-        # Use PIL ImageGrab for Windows
-        screenshot = ImageGrab.grab()
-        screenshot.save(filename)
+        if USE_MSS:
+            grab_screen(filename)
+        else:
+            # Fallback to PIL ImageGrab
+            save_screenshot(ImageGrab.grab(), filename)
     else:  # Linux
-        # Try using scrot or gnome-screenshot
         try:
-            subprocess.run(["scrot", str(filename)], check=True)
-        except FileNotFoundError:
+            # mss captures in-process (X11); Wayland sessions fall through to the screenshot tools
+            if not USE_MSS:
+                raise RuntimeError("mss not installed")
+            grab_screen(filename)
+        except Exception:
+            # Try using scrot or gnome-screenshot
             try:
-                subprocess.run(["gnome-screenshot", "-f", str(filename)], check=True)
+                subprocess.run(["scrot", "-q", str(JPEG_QUALITY), str(filename)], check=True)
             except FileNotFoundError:
-                # Fallback to PIL
-                screenshot = ImageGrab.grab()
-                screenshot.save(filename)
+                try:
+                    subprocess.run(["gnome-screenshot", "-f", str(filename)], check=True)
+                except FileNotFoundError:
+                    # Fallback to PIL
+                    save_screenshot(ImageGrab.grab(), filename)
     
     print(f"📸 Screenshot saved: {filename}")
     return filename
 
-def download_sfx(mp3_url: str, filename: str) -> Path:
+def download_sfx(mp3_url: str) -> Path:
     """
-    Download sound effect from URL.
+    Download sound effect from URL, cached on disk by URL.
     
     Sound effects provided by MyInstants API (https://github.com/abdipr/myinstants-api)
     Sounds sourced from MyInstants.com. Used with attribution for non-commercial purposes.
     """
-    sfx_path = SCREENSHOT_DIR / filename
+    if mp3_url in sfx_cache:
+        return sfx_cache[mp3_url]
+    
+    sfx_path = SFX_CACHE_DIR / f"{hashlib.sha1(mp3_url.encode()).hexdigest()}.mp3"
+    if sfx_path.exists():
+        # Downloaded in an earlier run
+        sfx_cache[mp3_url] = sfx_path
+        return sfx_path
+    
+    # Write to a .part file and rename, so a failed download never leaves a truncated cache entry
+    part_path = sfx_path.with_suffix(".part")
     try:
-        response = requests.get(mp3_url, timeout=10)
+        response = sfx_session.get(mp3_url, timeout=10)
         response.raise_for_status()
-        with open(sfx_path, 'wb') as f:
+        with open(part_path, 'wb') as f:
             f.write(response.content)
+        os.replace(part_path, sfx_path)
+        sfx_cache[mp3_url] = sfx_path
         return sfx_path
     except Exception as e:
         print(f"⚠️  Failed to download SFX: {e}")
+        part_path.unlink(missing_ok=True)
         return None
 
 def play_audio(audio_file: Path, max_duration: float = None):
@@ -105,7 +177,7 @@ def play_audio(audio_file: Path, max_duration: float = None):
     elif system == "Windows":
         # Use ffplay with duration limit (hidden window)
         try:
-            cmd = ["ffplay", "-nodisp", "-autoexit", str(audio_file)]
+            cmd = ["ffplay", "-nodisp", "-autoexit", *FFPLAY_LOW_LATENCY_FLAGS, str(audio_file)]
             if max_duration:
                 cmd.extend(["-t", str(max_duration)])
             
@@ -142,8 +214,11 @@ def play_audio(audio_file: Path, max_duration: float = None):
     else:  # Linux
         # Try various Linux audio players
         for player in ["paplay", "mpg123", "ffplay", "aplay"]:
+            cmd = [player, str(audio_file)]
+            if player == "ffplay":
+                cmd = [player, "-nodisp", "-autoexit", *FFPLAY_LOW_LATENCY_FLAGS, str(audio_file)]
             try:
-                process = subprocess.Popen([player, str(audio_file)], 
+                process = subprocess.Popen(cmd, 
                                           stdout=subprocess.DEVNULL, 
                                           stderr=subprocess.DEVNULL)
                 if max_duration:
@@ -159,79 +234,87 @@ def play_audio(audio_file: Path, max_duration: float = None):
             except FileNotFoundError:
                 continue
 
-async def generate_narration(include_minecraft=False):
-    """Generate narration for current screenshots (runs in background)"""
-    python_cmd = "python" if platform.system() == "Windows" else "python3"
+def read_minecraft_data():
+    """Minecraft data file contents (None if missing); only rereads and rehashes the file when its mtime changes"""
+    global minecraft_data_cache
+    try:
+        mtime_ns = MINECRAFT_DATA_FILE.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
     
-    server_params = StdioServerParameters(
+    if mtime_ns != minecraft_data_cache[0]:
+        contents = MINECRAFT_DATA_FILE.read_text()
+        minecraft_data_cache = (mtime_ns, contents, hashlib.sha1(contents.encode()).digest())
+    return minecraft_data_cache[1]
+
+def get_server_params():
+    """MCP server launch parameters for the narrator session"""
+    python_cmd = "python" if platform.system() == "Windows" else "python3"
+    return StdioServerParameters(
         command=python_cmd,
         args=["../mcp_server.py"],
-        env={
-            **os.environ,
-            "SCREENSHOT_DIR": str(SCREENSHOT_DIR),
-        }
+        env={**os.environ, "SCREENSHOT_DIR": str(SCREENSHOT_DIR)}
     )
+
+def is_session_closed(error):
+    """True if the error means the MCP server connection is gone and the session must be reopened"""
+    if isinstance(error, (BrokenPipeError, ConnectionError, anyio.ClosedResourceError, anyio.BrokenResourceError)):
+        return True
+    return "Connection closed" in str(error)
+
+async def generate_narration(session, include_minecraft=False):
+    """Generate narration for current screenshots (runs in background)"""
+    global sent_minecraft_digest
     
     try:
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-                
-                # Get screenshots
-                result = await session.call_tool("get_screenshot", {})
-                
-                # Check for Minecraft data
-                minecraft_data_file = SCREENSHOT_DIR / "minecraft_data.json"
-                if include_minecraft and minecraft_data_file.exists():
-                    with open(minecraft_data_file, 'r') as f:
-                        minecraft_data = f.read()
-                    await session.call_tool("get_minecraft_input", {
-                        "minecraft_data": minecraft_data
-                    })
-                
-                # Use combined describe_for_narration tool (faster - one API call)
-                # This now returns JSON with narration + SFX info
-                result = await session.call_tool("describe_for_narration", {
-                    "image_count": 2,
-                    "include_minecraft": include_minecraft
-                })
-                
-                # Parse JSON response
-                response_data = json.loads(result.content[0].text)
-                narration = response_data["narration"]
-                sfx_info = response_data.get("sfx")
-                
-                # Add to queue with SFX info
-                with queue_lock:
-                    narration_queue.append({
-                        "narration": narration,
-                        "sfx": sfx_info
-                    })
-                    sfx_text = f" (SFX: {sfx_info['query']})" if sfx_info else ""
-                    print(f"📝 Narration queued ({len(narration_queue)} in queue): {narration[:50]}...{sfx_text}")
+        narration_args = {
+            "image_count": 2,
+            "include_minecraft": include_minecraft
+        }
+        
+        # Check for Minecraft data (the server keeps the last data it was sent, so only send changes).
+        # Compared by content: the receiver may rewrite the file with the same events.
+        minecraft_data = read_minecraft_data() if include_minecraft else None
+        if minecraft_data is not None and minecraft_data_cache[2] != sent_minecraft_digest:
+            narration_args["minecraft_data"] = minecraft_data
+            sent_minecraft_digest = minecraft_data_cache[2]
+        
+        # One round trip: prune screenshots + store Minecraft data + describe_for_narration
+        # This returns JSON with narration + SFX info
+        result = await session.call_tool("narrate_from_context", narration_args)
+        
+        # Parse JSON response
+        response_data = orjson.loads(result.content[0].text)
+        narration = response_data["narration"]
+        sfx_info = response_data.get("sfx")
+        
+        # Add to queue with SFX info, dropping the oldest narration if audio has fallen behind
+        if narration_queue.full():
+            narration_queue.get_nowait()
+            print("🗑️  Dropped stale narration")
+        narration_queue.put_nowait({
+            "narration": narration,
+            "sfx": sfx_info
+        })
+        sfx_text = f" (SFX: {sfx_info['query']})" if sfx_info else ""
+        print(f"📝 Narration queued ({narration_queue.qsize()} in queue): {narration[:50]}...{sfx_text}")
     except KeyboardInterrupt:
         raise
     except Exception as e:
+        if is_session_closed(e):
+            print(f"🔌 MCP server connection lost: {e}")
+            session_lost.set()
         # Suppress process termination errors - they're expected during cleanup
-        if "Process group termination" not in str(e) and "TaskGroup" not in str(e):
+        elif "Process group termination" not in str(e) and "TaskGroup" not in str(e):
             print(f"❌ Error generating narration: {e}")
 
-async def process_audio_queue():
+async def process_audio_queue(session):
     """Process queued narrations and play audio"""
-    global is_playing_audio
-    
     while True:
-        # Wait if no narrations queued
-        if not narration_queue:
-            await asyncio.sleep(1)
-            continue
-        
-        # Get ALL queued narrations
-        with queue_lock:
-            if not narration_queue:
-                continue
-            batch_items = narration_queue.copy()
-            narration_queue.clear()
+        # Wake as soon as a narration is queued, then take ALL queued narrations
+        batch_items = [await narration_queue.get()]
+        while not narration_queue.empty():
+            batch_items.append(narration_queue.get_nowait())
         
         # Extract narrations and get first SFX (they should all be similar)
         batch_narrations = [item["narration"] for item in batch_items]
@@ -244,43 +327,30 @@ async def process_audio_queue():
         print(f"{'='*50}")
         
         # Generate audio
-        is_playing_audio = True
-        python_cmd = "python" if platform.system() == "Windows" else "python3"
-        
-        server_params = StdioServerParameters(
-            command=python_cmd,
-            args=["../mcp_server.py"],
-            env={
-                **os.environ,
-                "SCREENSHOT_DIR": str(SCREENSHOT_DIR),
-            }
-        )
-        
+        sfx_task = None
         try:
-            async with stdio_client(server_params) as (read, write):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    
-                    # Use summarize_narrations tool to condense all into one sentence
-                    result = await session.call_tool("summarize_narrations", {
-                        "narrations": batch_narrations
-                    })
-                    summarized_text = result.content[0].text
-                    print(f"📝 Summary: {summarized_text}")
-                    
-                    audio_filename = f"narration_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp3"
-                    result = await session.call_tool("tts", {
-                        "text": summarized_text,
-                        "output_file": audio_filename
-                    })
-                    
-                    audio_path = SCREENSHOT_DIR / audio_filename
-                    
-            # Download sound effect if available
-            sfx_path = None
+            # Start the SFX download now so it overlaps with summarizing + TTS
             if sfx_info:
                 print(f"📥 Downloading SFX: {sfx_info['title']}")
-                sfx_path = download_sfx(sfx_info['mp3'], f"sfx_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp3")
+                sfx_task = asyncio.create_task(asyncio.to_thread(download_sfx, sfx_info['mp3']))
+            
+            # Use summarize_narrations tool to condense all into one sentence
+            result = await session.call_tool("summarize_narrations", {
+                "narrations": batch_narrations
+            })
+            summarized_text = result.content[0].text
+            print(f"📝 Summary: {summarized_text}")
+            
+            audio_filename = f"narration_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp3"
+            result = await session.call_tool("tts", {
+                "text": summarized_text,
+                "output_file": audio_filename
+            })
+            
+            audio_path = SCREENSHOT_DIR / audio_filename
+            
+            # Sound effect if available (download started above)
+            sfx_path = await sfx_task if sfx_task else None
             
             # Play narration first, then SFX
             if audio_path.exists():
@@ -296,25 +366,28 @@ async def process_audio_queue():
         except KeyboardInterrupt:
             raise
         except Exception as e:
+            if is_session_closed(e):
+                print(f"🔌 MCP server connection lost: {e}")
+                session_lost.set()
             # Suppress process termination errors - they're expected during cleanup
-            if "Process group termination" not in str(e) and "TaskGroup" not in str(e):
+            elif "Process group termination" not in str(e) and "TaskGroup" not in str(e):
                 print(f"❌ Error processing audio: {e}")
         finally:
-            is_playing_audio = False
             print(f"{'='*50}\n")
 
+def port_open(port: int) -> bool:
+    """Quick localhost probe, bounded to 50ms so a closed port never stalls startup"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.settimeout(0.05)
+        return sock.connect_ex(('localhost', port)) == 0
+
 def start_minecraft_receiver():
     """Start the Minecraft receiver server in background"""
     python_cmd = "python" if platform.system() == "Windows" else "python3"
     
     try:
         # Check if receiver is already running
-        import socket
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        result = sock.connect_ex(('localhost', 8080))
-        sock.close()
-        
-        if result == 0:
+        if port_open(RECEIVER_PORT):
             print("🎮 Minecraft receiver already running on port 8080")
             return None
         
@@ -324,34 +397,47 @@ def start_minecraft_receiver():
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL
         )
-        time.sleep(1)  # Give it time to start
+        # Wait until it is listening (at most ~1s) instead of always sleeping a full second
+        for _ in range(20):
+            if port_open(RECEIVER_PORT):
+                break
+            time.sleep(0.05)
         print("🎮 Minecraft receiver started on port 8080")
         return receiver_process
     except Exception as e:
         print(f"⚠️  Could not start Minecraft receiver: {e}")
         return None
 
-async def screenshot_loop(receiver_process):
+async def screenshot_loop(receiver_process, session):
     """Main loop: take screenshots and generate narrations in background"""
-    minecraft_data_file = SCREENSHOT_DIR / "minecraft_data.json"
     screenshot_count = 0
+    loop = asyncio.get_running_loop()
+    next_tick = loop.time()
     
     try:
         while True:
-            # Take screenshot
-            take_screenshot()
+            # Take screenshot (capture + encode in a worker thread so audio playback isn't stalled)
+            await asyncio.to_thread(take_screenshot)
             screenshot_count += 1
             
             # Check if Minecraft data exists
-            include_minecraft = minecraft_data_file.exists()
+            include_minecraft = read_minecraft_data() is not None
             
             # Process every 2 screenshots (so we have before/after)
             if screenshot_count >= 2:
-                # Generate narration in background (doesn't block)
-                asyncio.create_task(generate_narration(include_minecraft=include_minecraft))
+                if narration_queue.qsize() > MAX_QUEUED_NARRATIONS // 2:
+                    # Audio is behind; a narration generated now would be stale before it plays
+                    print(f"⏭️  Skipping narration ({narration_queue.qsize()} already queued)")
+                else:
+                    # Generate narration in background (doesn't block)
+                    task = asyncio.create_task(generate_narration(session, include_minecraft=include_minecraft))
+                    narration_tasks.add(task)
+                    task.add_done_callback(narration_tasks.discard)
             
-            # Wait for next screenshot
-            await asyncio.sleep(INTERVAL)
+            # Wait for next screenshot on a fixed schedule, so capture time (or a busy loop) doesn't
+            # stretch the interval; playback runs in process_audio_queue and never delays captures
+            next_tick = max(next_tick + INTERVAL, loop.time())
+            await asyncio.sleep(next_tick - loop.time())
             
     except KeyboardInterrupt:
         print("\n\n👋 Stopping screenshot narrator...")
@@ -376,11 +462,32 @@ async def main():
     
     print("\nPress Ctrl+C to stop\n")
     
-    # Run both loops concurrently
-    await asyncio.gather(
-        screenshot_loop(receiver_process),
-        process_audio_queue()
-    )
+    # Run both loops concurrently on one long-lived MCP server session
+    global sent_minecraft_digest
+    while True:
+        session_lost.clear()
+        sent_minecraft_digest = None  # A new server process has no Minecraft data yet
+        async with stdio_client(get_server_params()) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                print("🔌 MCP server session ready")
+                
+                loops = asyncio.gather(
+                    screenshot_loop(receiver_process, session),
+                    process_audio_queue(session)
+                )
+                lost = asyncio.create_task(session_lost.wait())
+                await asyncio.wait({loops, lost}, return_when=asyncio.FIRST_COMPLETED)
+                lost.cancel()
+                if loops.done():
+                    return loops.result()
+                # Let the old session's tasks finish before clearing session_lost, so a late failure
+                # on the closed session can't flag the next one as lost
+                loops.cancel()
+                for task in narration_tasks:
+                    task.cancel()
+                await asyncio.gather(loops, *narration_tasks, return_exceptions=True)
+        print("🔌 Reopening MCP server session...")
 
 if __name__ == "__main__":
     import asyncio
@@ -6,6 +6,7 @@ Shows how sound effects are automatically selected and played with narrations
 
 import asyncio
 import os
+import re
 import json
 import requests
 import subprocess
@@ -21,6 +22,14 @@ load_dotenv()
 SCREENSHOT_DIR = Path(os.getenv("SCREENSHOT_DIR", "./screenshots"))
 SCREENSHOT_DIR.mkdir(exist_ok=True)
 
+# SFX query per narration keyword, in priority order (one compiled alternation per category)
+SFX_KEYWORD_PATTERNS = [
+    ("laugh", re.compile("laugh|funny|hilarious|joke")),
+    ("bruh", re.compile("fail|died|death|damage")),
+    ("explosion", re.compile("explosion|explode|boom|tnt")),
+    ("wow", re.compile("wow|amazing|incredible")),
+]
+
 def download_sfx(mp3_url: str, filename: str) -> Path:
     """Download sound effect from URL"""
     sfx_path = SCREENSHOT_DIR / filename
@@ -43,11 +52,10 @@ def play_audio(audio_file: Path):
     if system == "Darwin":  # macOS
         subprocess.run(["afplay", str(audio_file)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
-async def get_sfx_for_narration(narration: str):
-    """Get appropriate sound effect based on narration content"""
+def get_server_params():
+    """MCP server launch parameters for the demo session"""
     python_cmd = "python" if platform.system() == "Windows" else "python3"
-    
-    server_params = StdioServerParameters(
+    return StdioServerParameters(
         command=python_cmd,
         args=["mcp_server.py"],
         env={
@@ -55,90 +63,70 @@ async def get_sfx_for_narration(narration: str):
             "SCREENSHOT_DIR": str(SCREENSHOT_DIR),
         }
     )
-    
+
+async def get_sfx_for_narration(session, narration: str):
+    """Get appropriate sound effect based on narration content"""
     try:
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-                
-                # Determine search query based on narration keywords
-                query = "bruh"  # default
-                narration_lower = narration.lower()
-                
-                if any(word in narration_lower for word in ["laugh", "funny", "hilarious", "joke"]):
-                    query = "laugh"
-                elif any(word in narration_lower for word in ["fail", "died", "death", "damage"]):
-                    query = "bruh"
-                elif any(word in narration_lower for word in ["explosion", "explode", "boom", "tnt"]):
-                    query = "explosion"
-                elif any(word in narration_lower for word in ["wow", "amazing", "incredible"]):
-                    query = "wow"
-                
-                # Get sound effects
-                result = await session.call_tool("get_sfx", {
-                    "query": query,
-                    "limit": 1
-                })
-                
-                sfx_data = json.loads(result.content[0].text)
-                if sfx_data and len(sfx_data) > 0:
-                    return sfx_data[0], query
-                return None, query
-                
+        # Determine search query based on narration keywords
+        narration_lower = narration.lower()
+        query = next(
+            (query for query, pattern in SFX_KEYWORD_PATTERNS if pattern.search(narration_lower)),
+            "bruh"  # default
+        )
+        
+        # Get sound effects
+        result = await session.call_tool("get_sfx", {
+            "query": query,
+            "limit": 1
+        })
+        
+        sfx_data = json.loads(result.content[0].text)
+        if sfx_data and len(sfx_data) > 0:
+            return sfx_data[0], query
+        return None, query
+        
     except Exception as e:
         print(f"⚠️  Error getting SFX: {e}")
         return None, None
 
-async def generate_tts(text: str):
+async def generate_tts(session, text: str, audio_filename: str):
     """Generate TTS audio"""
-    python_cmd = "python" if platform.system() == "Windows" else "python3"
-    
-    server_params = StdioServerParameters(
-        command=python_cmd,
-        args=["mcp_server.py"],
-        env={
-            **os.environ,
-            "SCREENSHOT_DIR": str(SCREENSHOT_DIR),
-        }
-    )
-    
     try:
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-                
-                audio_filename = f"demo_narration_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp3"
-                await session.call_tool("tts", {
-                    "text": text,
-                    "output_file": audio_filename
-                })
-                
-                return SCREENSHOT_DIR / audio_filename
+        await session.call_tool("tts", {
+            "text": text,
+            "output_file": audio_filename
+        })
+        
+        return SCREENSHOT_DIR / audio_filename
     except Exception as e:
         print(f"❌ Error generating TTS: {e}")
         return None
 
-async def demo_narration_with_sfx(narration: str):
+async def prepare_narration(session, index: int, narration: str):
+    """Look up the SFX, then download it while the narration audio is generated"""
+    sfx_info, query = await get_sfx_for_narration(session, narration)
+    if not sfx_info:
+        return narration, query, None, None, None
+    
+    # Index in the file names: items are prepared concurrently, so timestamps can collide
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    sfx_path, narration_path = await asyncio.gather(
+        asyncio.to_thread(download_sfx, sfx_info['mp3'], f"demo_sfx_{stamp}_{index}.mp3"),
+        generate_tts(session, narration, f"demo_narration_{stamp}_{index}.mp3")
+    )
+    return narration, query, sfx_info, sfx_path, narration_path
+
+async def play_narration(prepared):
     """Demo: Play narration with automatic SFX"""
+    narration, query, sfx_info, sfx_path, narration_path = prepared
     print(f"\n{'='*70}")
     print(f"📝 Narration: {narration}")
     print(f"{'='*70}")
     
-    # Get appropriate sound effect
-    print(f"🔍 Analyzing narration for sound effects...")
-    sfx_info, query = await get_sfx_for_narration(narration)
-    
     if sfx_info:
         print(f"✅ Selected SFX category: '{query}'")
         print(f"🎵 Sound effect: {sfx_info['title']}")
         
-        # Download SFX
-        sfx_path = download_sfx(sfx_info['mp3'], f"demo_sfx_{datetime.now().strftime('%H%M%S')}.mp3")
-        
-        # Generate TTS
-        print(f"🎤 Generating narration audio...")
-        narration_path = await generate_tts(narration)
-        
         if sfx_path and narration_path:
             # Play both in parallel for faster playback
             print(f"🔊 Playing sound effect + narration in parallel...")
@@ -179,9 +167,21 @@ async def main():
         "Wow, this genius actually managed to beat the Ender Dragon on the first try!",
     ]
     
-    for narration in narrations:
-        await demo_narration_with_sfx(narration)
-        await asyncio.sleep(1)
+    # One MCP server for the whole demo instead of one per SFX search / TTS call
+    async with stdio_client(get_server_params()) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            
+            # SFX lookups, downloads and TTS for every item run concurrently;
+            # only playback is serial (one speaker)
+            print(f"🔍 Preparing {len(narrations)} narrations with sound effects...")
+            prepared = await asyncio.gather(
+                *(prepare_narration(session, i, narration) for i, narration in enumerate(narrations))
+            )
+            
+            for item in prepared:
+                await play_narration(item)
+                await asyncio.sleep(1)
     
     print("=" * 70)
     print("✅ Demo complete!")
@@ -3,7 +3,7 @@
 
 import asyncio
 import os
-import json
+import orjson
 from pathlib import Path
 from dotenv import load_dotenv
 from mcp import ClientSession, StdioServerParameters
@@ -28,13 +28,13 @@ async def test_integrated_sfx():
     )
     
     # Create a fake Minecraft event to test
-    minecraft_data = json.dumps([
+    minecraft_data = orjson.dumps([
         {
             "timestamp": "2024-11-08T19:00:00",
             "event_type": "damage_taken",
             "details": {"amount": 10, "source": "fall"}
         }
-    ])
+    ]).decode()
     
     async with stdio_client(server_params) as (read, write):
         async with ClientSession(read, write) as session:
@@ -58,7 +58,7 @@ async def test_integrated_sfx():
             response_text = result.content[0].text
             print(f"\n📦 Raw response:\n{response_text}\n")
             
-            response_data = json.loads(response_text)
+            response_data = orjson.loads(response_text)
             
             print("=" * 60)
             print("✅ Parsed Response:")
@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """Test if Minecraft receiver is getting data"""
 
-import json
+import os
+import orjson
 import time
 from pathlib import Path
 
@@ -16,37 +17,41 @@ if not MINECRAFT_DATA_FILE.exists():
 else:
     print("✅ File exists!")
 
-last_content = None
+last_mtime = None
 last_timestamp = None
 
 try:
     while True:
-        if MINECRAFT_DATA_FILE.exists():
-            with open(MINECRAFT_DATA_FILE, 'r') as f:
-                content = f.read()
-                
-            if content != last_content:
-                print(f"\n🔄 File updated at {time.strftime('%H:%M:%S')}")
-                try:
-                    events = json.loads(content)
-                    print(f"📊 Total events: {len(events)}")
-                    
-                    if events:
-                        latest = events[-1]
-                        print(f"📝 Latest event:")
-                        print(f"   Type: {latest.get('event_type')}")
-                        print(f"   Time: {latest.get('timestamp')}")
-                        print(f"   Details: {latest.get('details')}")
-                        
-                        if latest.get('timestamp') != last_timestamp:
-                            print("   ✅ NEW EVENT!")
-                            last_timestamp = latest.get('timestamp')
-                except json.JSONDecodeError:
-                    print("⚠️  Invalid JSON")
-                
-                last_content = content
+        # One stat per poll; only read the file when it has actually changed
+        try:
+            mtime = os.stat(MINECRAFT_DATA_FILE).st_mtime
+        except FileNotFoundError:
+            time.sleep(1)
+            continue
         
-        time.sleep(1)
+        if mtime == last_mtime:
+            time.sleep(0.5)
+            continue
+        last_mtime = mtime
+        
+        content = MINECRAFT_DATA_FILE.read_bytes()
+        print(f"\n🔄 File updated at {time.strftime('%H:%M:%S')}")
+        try:
+            events = orjson.loads(content)
+            print(f"📊 Total events: {len(events)}")
+            
+            if events:
+                latest = events[-1]
+                print(f"📝 Latest event:")
+                print(f"   Type: {latest.get('event_type')}")
+                print(f"   Time: {latest.get('timestamp')}")
+                print(f"   Details: {latest.get('details')}")
+                
+                if latest.get('timestamp') != last_timestamp:
+                    print("   ✅ NEW EVENT!")
+                    last_timestamp = latest.get('timestamp')
+        except orjson.JSONDecodeError:
+            print("⚠️  Invalid JSON")
         
 except KeyboardInterrupt:
     print("\n\n👋 Stopped monitoring")
@@ -2,12 +2,17 @@
 """Test the MyInstants API integration"""
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
 
+# One session for every search, so only the first pays the TCP/TLS handshake
+sfx_session = requests.Session()
+sfx_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
 def test_search(query):
     print(f"\n🔍 Searching for: {query}")
     try:
-        response = requests.get(
+        response = sfx_session.get(
             "https://myinstants-api.vercel.app/search",
             params={"q": query},
             timeout=10
@@ -10,45 +10,71 @@ Sounds obtained via web scraping. Used with attribution for non-commercial purpo
 """
 
 import os
-import glob
-import base64
-import json
 from pathlib import Path
-from typing import Optional
 import google.generativeai as genai
 from mcp.server import Server
 from mcp.types import Tool, TextContent, ImageContent
-from mcp_tool_utils import ToolDefinitions, ToolHandlers
+from mcp_tool_utils import ToolDefinitions, ToolHandlers, NARRATION_SYSTEM_INSTRUCTION
 import mcp.server.stdio
-from PIL import Image
-import subprocess
+import asyncio
 from elevenlabs import ElevenLabs
-import requests
 
 # Initialize clients for API
 genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
 gemini_model = genai.GenerativeModel('gemini-2.5-flash')
 elevenlabs_client = ElevenLabs(api_key=os.getenv("ELEVENLABS_API_KEY"))
 
+# Narration replies are a bare JSON object, so the model emits no markdown fence tokens
+NARRATION_GENERATION_CONFIG = {"response_mime_type": "application/json"}
+
+# Narration model: shared instructions live in the system instruction, so prompts only carry per-call context
+narration_model = genai.GenerativeModel(
+    'gemini-2.5-flash',
+    system_instruction=NARRATION_SYSTEM_INSTRUCTION,
+    generation_config=NARRATION_GENERATION_CONFIG
+)
+
 # Screenshot directory - created at runtime if it doesn't exist
 SCREENSHOT_DIR = Path(os.getenv("SCREENSHOT_DIR", "./screenshots"))
 SCREENSHOT_DIR.mkdir(exist_ok=True)
 MAX_SCREENSHOTS = 5
-
-# Minecraft mod data storage - file created by minecraft_receiver.py when events arrive
-MINECRAFT_DATA_FILE = SCREENSHOT_DIR / "minecraft_data.json"
+# Screenshots are downscaled to this longest edge before upload; Gemini tiles images at 768px
+MAX_IMAGE_EDGE = int(os.getenv("MAX_IMAGE_EDGE", "768"))
 
 app = Server("narrator")
 
+# Limit concurrent Gemini/TTS work so overlapping requests queue instead of thrashing
+gemini_sema = asyncio.Semaphore(2)
+synth_sema = asyncio.Semaphore(1)
+
 # Initialize tool handlers
 handlers = ToolHandlers(
     screenshot_dir=SCREENSHOT_DIR,
     max_screenshots=MAX_SCREENSHOTS,
     gemini_model=gemini_model,
+    narration_model=narration_model,
     elevenlabs_client=elevenlabs_client,
-    minecraft_data_file=MINECRAFT_DATA_FILE
+    max_image_edge=MAX_IMAGE_EDGE,
+    gemini_sema=gemini_sema,
+    synth_sema=synth_sema
 )
 
+# process_batch is left out: it takes gemini_sema and synth_sema itself, one per step
+tool_semaphores = {
+    "describe": gemini_sema,
+    "narrate": gemini_sema,
+    "describe_for_narration": gemini_sema,
+    "narrate_from_context": gemini_sema,
+    "summarize_narrations": gemini_sema,
+    "tts": synth_sema
+}
+
+# Tool name -> (handler, semaphore or None), so each call is a single dict lookup
+tool_dispatch = {
+    name: (handler, tool_semaphores.get(name))
+    for name, handler in handlers.tool_map.items()
+}
+
 # Describe tools given to the LLM
 @app.list_tools()
 async def list_tools() -> list[Tool]:
@@ -58,34 +84,30 @@ async def list_tools() -> list[Tool]:
 @app.call_tool()
 async def call_tool(name: str, arguments: dict) -> list[TextContent | ImageContent]:
     """Dispatch tool calls to appropriate handlers"""
-    # Map tool names to handler methods
-    tool_map = {
-        "get_screenshot": handlers.handle_get_screenshot,
-        "get_minecraft_input": handlers.handle_get_minecraft_input,
-        "describe": handlers.handle_describe,
-        "narrate": handlers.handle_narrate,
-        "describe_for_narration": handlers.handle_describe_for_narration,
-        "summarize_narrations": handlers.handle_summarize_narrations,
-        "get_sfx": handlers.handle_get_sfx,
-        "tts": handlers.handle_tts
-    }
-    
-    # Dispatch to appropriate handler
-    handler = tool_map.get(name)
-    if handler:
-        return await handler(arguments)
-    else:
+    entry = tool_dispatch.get(name)
+    if entry is None:
         return [TextContent(type="text", text=f"Unknown tool: {name}")]
+    
+    handler, sema = entry
+    if sema:
+        async with sema:
+            return await handler(arguments)
+    return await handler(arguments)
 
 
 async def main():
-    async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            app.create_initialization_options()
-        )
+    warm_task = asyncio.create_task(handlers.warm_connections())  # Runs while the client initializes
+    try:
+        async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
+            await app.run(
+                read_stream,
+                write_stream,
+                app.create_initialization_options()
+            )
+    finally:
+        # A client that disconnects right away can beat the warm-up; don't leave it running
+        warm_task.cancel()
+        await asyncio.gather(warm_task, return_exceptions=True)
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(main())
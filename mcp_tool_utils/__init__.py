@@ -6,10 +6,13 @@ Contains tool definitions, handlers, and utilities for the Narrator MCP Server
 # Defines this package and where to get the definitions
 from .tool_definitions import ToolDefinitions
 from .tool_handlers import ToolHandlers
+from .gemini_cache import GeminiCache
+from .prompts import NARRATION_SYSTEM_INSTRUCTION
 from .utilities import (
     cleanup_old_screenshots,
     cleanup_old_audio,
     encode_image,
+    downscale_image,
     get_sfx_query_from_narration,
     get_last_screenshots
 )
@@ -18,9 +21,12 @@ from .utilities import (
 __all__ = [
     'ToolDefinitions',
     'ToolHandlers',
+    'GeminiCache',
+    'NARRATION_SYSTEM_INSTRUCTION',
     'cleanup_old_screenshots',
     'cleanup_old_audio',
     'encode_image',
+    'downscale_image',
     'get_sfx_query_from_narration',
     'get_last_screenshots'
 ]
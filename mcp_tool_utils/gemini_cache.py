@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Gemini Response Cache
+Keeps recent Gemini responses so identical requests skip the API round trip
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+
+class GeminiCache:
+    """LRU cache of Gemini response text keyed on prompt + screenshot contents"""
+    
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()  # Handlers call Gemini from worker threads
+    
+    @staticmethod
+    def hash_image(data: bytes) -> bytes:
+        """Digest of one screenshot's bytes, for use in make_key"""
+        return hashlib.md5(data).digest()
+    
+    @staticmethod
+    def make_key(model_id: str, prompt: str, image_digests: list[bytes] = ()) -> str:
+        """
+        Build a cache key from the model, the prompt and each screenshot's digest (see hash_image).
+        model_id must identify the model name, system instruction and generation config
+        (repr() of a GenerativeModel does). Minecraft data is part of the prompt text, so it is covered too.
+        """
+        key = hashlib.md5(model_id.encode("utf-8"))
+        key.update(b"\0")
+        key.update(prompt.encode("utf-8"))
+        for digest in image_digests:
+            key.update(digest)
+        return key.hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return cached response text, or None on a miss"""
+        with self.lock:
+            if key not in self.entries:
+                return None
+            self.entries.move_to_end(key)
+            return self.entries[key]
+    
+    def put(self, key: str, text: str):
+        """Store response text, evicting the least recently used entry when full"""
+        with self.lock:
+            self.entries[key] = text
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Prompt Text
+Static prompt text shared by the Narrator MCP Server tools
+Prompts are built once at import; handlers only substitute the dynamic parts
+"""
+
+from string import Template
+
+# SFX keywords the narration model chooses from (each one is a MyInstants search query)
+SFX_KEYWORDS = ("bruh", "laugh", "explosion", "wow", "scream", "crash", "fail", "epic", "oof", "yeet")
+
+# Shared instructions for every describe_for_narration call. Set as the narration
+# model's system instruction rather than written into each prompt template.
+# Kept neutral about the source: screenshot prompts cover any on-screen activity, Minecraft prompts add the game context.
+NARRATION_SYSTEM_INSTRUCTION = """You narrate what someone is doing on their screen for comedic effect.
+Every response is ONE sentence of narration plus ONE sound effect keyword that would be funny with it.
+
+Respond in JSON format:
+{"narration": "your funny narration here", "sfx_keyword": "keyword"}
+
+Sound effect keywords: """ + ", ".join(SFX_KEYWORDS)
+
+# describe prompts keyed by (screenshot count, has Minecraft data)
+DESCRIBE_PROMPTS = {
+    (2, True): Template("""In 1-2 sentences, describe in detail what is happening by combining:
+1. In sequence the visuals of the two screenshots (first is older, second is newer)
+2. Minecraft gameplay events: $minecraft_context
+
+Connect the on-screen activity with the in-game actions to tell a cohesive story."""),
+    (2, False): Template("In 1-2 sentences, describe what is happening within the last two screenshots as a sequence in detail (first is older, second is newer)."),
+    (1, True): Template("In 1-2 sentences, describe what is happening in this screenshot in detail.\n\nMinecraft events: $minecraft_context"),
+    (1, False): Template("In 1-2 sentences, describe what is happening in this screenshot in detail."),
+    (0, True): Template("In 1-2 sentences, describe what is happening based on these Minecraft events: $minecraft_context")
+}
+
+# describe_for_narration prompts for screenshot input, keyed by (screenshot count, has Minecraft data)
+NARRATION_PROMPTS = {
+    (2, True): Template("""Analyze these two screenshots (first is older, second is newer) and Minecraft events: $minecraft_context
+
+Generate ONE sentence of funny, sarcastic sports-commentator-style narration about what's happening.
+Then suggest ONE sound effect keyword that would be funny with this narration."""),
+    (2, False): Template("""Analyze these two screenshots (first is older, second is newer).
+
+Generate ONE sentence of funny, sarcastic sports-commentator-style narration about what's happening.
+Then suggest ONE sound effect keyword that would be funny with this narration."""),
+    (1, True): Template("""Analyze this screenshot and Minecraft events: $minecraft_context.
+
+Generate ONE sentence of funny, sarcastic sports-commentator-style narration about what's happening.
+Then suggest ONE sound effect keyword that would be funny with this narration."""),
+    (1, False): Template("""Analyze this screenshot.
+
+Generate ONE sentence of funny, sarcastic sports-commentator-style narration about what's happening.
+Then suggest ONE sound effect keyword that would be funny with this narration.""")
+}
+
+# narrate prompt for a description from describe
+NARRATE_PROMPT = Template("Based on this description: '$description'\n\nGenerate ONE sentence of funny, sarcastic sports-commentator-style narration. Be creative and entertaining!")
+
+# summarize_narrations prompt; $narrations is the numbered list, one per line
+SUMMARIZE_PROMPT = Template("""Summarize these $count narrations into ONE concise, funny sentence that captures the key action:
+
+$narrations
+
+Keep the sarcastic sports-commentator style. ONE sentence only!""")
+
+# Narration style keyed by the explicit flag
+STYLE_GUIDES = {
+    True: """Style: Funny, sarcastic sports-commentator. Be insulting and personal. Use profanity freely: dumbass, this fucker, birdbrain, asshole, bimbo, bonehead, cocksucker, cunt, wanker, dick, dipshit, dork, fatso, pisser, turd, twat, wimp, wuss, bozo, buffoon, moron, goon, imbecile. Don't hold back!""",
+    False: """Style: Act like a stand-up comedian doing crowd work! Be funny and positive using Reddit/meme culture. Reference popular memes, Reddit culture, gaming references, and internet humor. Be playful and encouraging while still being sarcastic. Use observational comedy and callbacks. Examples: "This is fine" meme, "Task failed successfully", "Suffering from success", "He's a little confused but he's got the spirit", "Professionals have standards", etc."""
+}
+
+# describe_for_narration prompt for Minecraft-only input, keyed by the explicit flag
+# The style guide is spliced in at import; calls only substitute the events and repetition mode
+_MINECRAFT_NARRATION_TEMPLATE = """Based on these Minecraft events: $minecraft_context
+
+$style_guide$repetition_context
+
+Generate ONE sentence of funny narration.
+Then suggest ONE sound effect keyword."""
+MINECRAFT_NARRATION_PROMPTS = {
+    explicit: Template(Template(_MINECRAFT_NARRATION_TEMPLATE).safe_substitute(style_guide=style_guide))
+    for explicit, style_guide in STYLE_GUIDES.items()
+}
+
+# Special modes for repetitive activity, keyed by the explicit flag
+REPETITION_PROMPTS = {
+    True: Template("""
+
+IMPORTANT: The player has been doing '$activity_mode' repeatedly! Instead of normal narration, pick ONE of these special modes:
+1. SING: Make up a short silly song about their repetitive behavior (2 lines max)
+2. THERAPY: Act like their therapist, asking why they keep doing this
+3. DAD JOKE: Tell a dad joke related to their activity, then roast them with it
+4. FUN FACT: Share a fun fact, then use it to roast them (e.g., "Did you know pigs don't shower? Does that make you a pig?")
+
+Be creative and mean in a funny way!"""),
+    False: Template("""
+
+IMPORTANT: The player has been doing '$activity_mode' repeatedly! Act like a stand-up comedian noticing this pattern. Pick ONE of these special modes:
+1. MEME: Reference a popular meme that fits their repetitive behavior (like a comedian would)
+2. REDDIT: Make a Reddit-style comment as if you're doing crowd work (like r/madlads or r/me_irl)
+3. GAMING REFERENCE: Reference a popular game/streamer moment with comedic timing
+4. WHOLESOME ROAST: Encourage them but in a hilariously backhanded way (classic stand-up style)
+
+Be creative and funny using internet culture and stand-up comedy techniques!""")
+}
@@ -4,6 +4,7 @@ MCP Tool Definitions
 Defines all available tools for the Narrator MCP Server
 """
 
+import functools
 from mcp.types import Tool
 
 
@@ -43,17 +44,23 @@ class ToolDefinitions:
     def describe() -> Tool:
         return Tool(
             name="describe",
-            description="Describes changes from screenshots and/or Minecraft mod data. At least one input required.",
+            description="Describes changes from screenshots and/or Minecraft mod data. At least one input required. For narration, use describe_for_narration instead - it describes and narrates in one call.",
             inputSchema={
                 "type": "object",
                 "properties": {
                     "image_count": {
                         "type": "number",
-                        "description": "Number of recent screenshots to analyze (0-5, default 2)"
+                        "minimum": 0,
+                        "maximum": 2,
+                        "description": "Number of recent screenshots to analyze (0-2, default 2)"
                     },
                     "include_minecraft": {
                         "type": "boolean",
                         "description": "Whether to include Minecraft mod data in the description"
+                    },
+                    "and_narrate": {
+                        "type": "boolean",
+                        "description": "Narrate in the same Gemini call and return describe_for_narration's JSON instead of a description"
                     }
                 },
                 "required": []
@@ -68,9 +75,15 @@ class ToolDefinitions:
             inputSchema={
                 "type": "object",
                 "properties": {
+                    "minecraft_data": {
+                        "type": "string",
+                        "description": "Optional JSON string of Minecraft events to store first (replaces a separate get_minecraft_input call)"
+                    },
                     "image_count": {
                         "type": "number",
-                        "description": "Number of recent screenshots to analyze (0-5, default 2)"
+                        "minimum": 0,
+                        "maximum": 2,
+                        "description": "Number of recent screenshots to analyze (0-2, default 2)"
                     },
                     "include_minecraft": {
                         "type": "boolean",
@@ -93,11 +106,75 @@ class ToolDefinitions:
             }
         )
     
+    @staticmethod
+    def narrate_from_context() -> Tool:
+        return Tool(
+            name="narrate_from_context",
+            description="Fused get_screenshot + get_minecraft_input + describe_for_narration for screenshot clients: prunes old screenshots, stores the given Minecraft data, and narrates in one call. Returns the same JSON as describe_for_narration.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "image_count": {
+                        "type": "number",
+                        "minimum": 0,
+                        "maximum": 2,
+                        "description": "Number of recent screenshots to analyze (0-2, default 2)"
+                    },
+                    "include_minecraft": {
+                        "type": "boolean",
+                        "description": "Whether to include Minecraft mod data (default: true when minecraft_data is given)"
+                    },
+                    "minecraft_data": {
+                        "type": "string",
+                        "description": "JSON string containing Minecraft events"
+                    },
+                    "explicit": {
+                        "type": "boolean",
+                        "description": "Whether to use explicit/profane language or family-friendly meme references"
+                    }
+                },
+                "required": []
+            }
+        )
+    
+    @staticmethod
+    def process_batch() -> Tool:
+        return Tool(
+            name="process_batch",
+            description="Fused get_minecraft_input + describe_for_narration (+ tts when output_file is given) for Minecraft-only clients: one call per batch of events. Returns describe_for_narration's JSON, plus the TTS result under 'tts' when synthesized.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "minecraft_data": {
+                        "type": "string",
+                        "description": "JSON string containing Minecraft events"
+                    },
+                    "is_repetitive": {
+                        "type": "boolean",
+                        "description": "Whether the player is doing repetitive activity"
+                    },
+                    "activity_mode": {
+                        "type": "string",
+                        "description": "The most common activity type in this batch"
+                    },
+                    "explicit": {
+                        "type": "boolean",
+                        "description": "Whether to use explicit/profane language or family-friendly meme references"
+                    },
+                    "output_file": {
+                        "type": "string",
+                        "description": "If set, also synthesize the narration to this filename (e.g., 'narration.mp3')"
+                    }
+                },
+                "required": ["minecraft_data"]
+            }
+        )
+    
     @staticmethod
     def narrate() -> Tool:
         return Tool(
             name="narrate",
-            description="Generates funny, sarcastic narration from a description",
+            description="Generates funny, sarcastic narration from a description. Deprecated: describe_for_narration produces narration directly without a separate describe call.",
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -168,14 +245,22 @@ class ToolDefinitions:
     
     @classmethod
     def get_all_tools(cls) -> list[Tool]:
-        """Returns all tool definitions"""
-        return [
+        """Returns all tool definitions (built once; each call gets a new list of the shared Tools)"""
+        return list(cls._all_tools())
+    
+    @classmethod
+    @functools.cache
+    def _all_tools(cls) -> tuple[Tool, ...]:
+        """All tool definitions, constructed on first use"""
+        return (
             cls.get_screenshot(),
             cls.get_minecraft_input(),
             cls.describe(),
             cls.describe_for_narration(),
+            cls.narrate_from_context(),
+            cls.process_batch(),
             cls.narrate(),
             cls.summarize_narrations(),
             cls.tts(),
             cls.get_sfx()
-        ]
+        )
@@ -4,21 +4,54 @@ MCP Tool Handlers
 Implementation of tool actions for the Narrator MCP Server
 """
 
-import json
+import sys
+import time
+import orjson
+import asyncio
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional
-from PIL import Image
+from typing import Optional, NamedTuple
 import google.generativeai as genai
 from elevenlabs import ElevenLabs
 from mcp.types import TextContent, ImageContent
+from .gemini_cache import GeminiCache
+from .prompts import (
+    DESCRIBE_PROMPTS,
+    NARRATION_PROMPTS,
+    MINECRAFT_NARRATION_PROMPTS,
+    NARRATE_PROMPT,
+    SUMMARIZE_PROMPT,
+    REPETITION_PROMPTS,
+    SFX_KEYWORDS
+)
 from .utilities import (
     cleanup_old_screenshots,
     get_last_screenshots,
     cleanup_old_audio,
+    downscale_image,
     get_sfx_query_from_narration
 )
 
+MYINSTANTS_SEARCH_URL = "https://myinstants-api.vercel.app/search"
+ELEVENLABS_VOICE_ID = "nPczCjzI2devNBz1zQrb"  # Brian voice
+SFX_CACHE_TTL = 600  # Seconds to reuse MyInstants results for a query
+SFX_CACHE_MAX_QUERIES = 256  # get_sfx accepts free-form queries, so bound the cache
+# Refreshed speculatively on each narration; warm_connections primes every keyword at startup
+SFX_PREFETCH_KEYWORDS = SFX_KEYWORDS[:4]
+
+# Narration MP3s are small, so a 1 MiB buffer turns per-chunk writes into ~one write() syscall
+AUDIO_WRITE_BUFFER = 1 << 20
+
+
+class MinecraftSnapshot(NamedTuple):
+    """Received Minecraft data and its serialized form, replaced as one object so readers never see a mix"""
+    data: object
+    json: str
+
 
 class ToolHandlers:
     """Handlers for all MCP tool implementations"""
@@ -28,17 +61,172 @@ class ToolHandlers:
         screenshot_dir: Path,
         max_screenshots: int,
         gemini_model,
+        narration_model,
         elevenlabs_client: ElevenLabs,
-        minecraft_data_file: Path
+        max_image_edge: int = 768,
+        gemini_sema: Optional[asyncio.Semaphore] = None,
+        synth_sema: Optional[asyncio.Semaphore] = None
     ):
         self.screenshot_dir = screenshot_dir
         self.max_screenshots = max_screenshots
         self.gemini_model = gemini_model
+        self.narration_model = narration_model  # Carries NARRATION_SYSTEM_INSTRUCTION
         self.elevenlabs_client = elevenlabs_client
-        self.minecraft_data_file = minecraft_data_file
-        self.last_minecraft_data = None
+        self.max_image_edge = max_image_edge  # Longest edge of screenshots sent to Gemini
+        # Shared with the server's per-tool limits; used by tools that mix Gemini and TTS steps
+        self.gemini_sema = gemini_sema or asyncio.Semaphore(2)
+        self.synth_sema = synth_sema or asyncio.Semaphore(1)
+        self.minecraft_snapshot = None  # Last Minecraft data received; the data file belongs to minecraft_receiver.py
         self.recent_sfx = []  # Sliding window of last 10 SFX IDs/titles
         self.max_recent_sfx = 10
+        self.gemini_cache = GeminiCache()
+        self.image_pool = ThreadPoolExecutor(max_workers=2)  # Reads/hashes/downscales screenshots in parallel
+        
+        # Loaded screenshots keyed by (path, mtime_ns) so repeat requests on the same frame skip disk + decode
+        self.image_cache = OrderedDict()
+        self.max_cached_images = 8
+        self.image_cache_lock = threading.Lock()  # Filled from image_pool threads
+        
+        # Persistent session so MyInstants searches reuse TCP/TLS connections
+        self.sfx_session = requests.Session()
+        self.sfx_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+        self.sfx_search_cache = OrderedDict()  # query -> (fetch time, sounds), least recently used first
+        self.sfx_cache_lock = threading.Lock()  # Searches run in worker threads
+        self.sfx_prefetch_tasks = {}  # keyword -> in-flight search started while Gemini runs
+        
+        # Tool name -> handler, built once so dispatch is a single dict lookup
+        self.tool_map = {
+            "get_screenshot": self.handle_get_screenshot,
+            "get_minecraft_input": self.handle_get_minecraft_input,
+            "describe": self.handle_describe,
+            "narrate": self.handle_narrate,
+            "describe_for_narration": self.handle_describe_for_narration,
+            "narrate_from_context": self.handle_narrate_from_context,
+            "process_batch": self.handle_process_batch,
+            "summarize_narrations": self.handle_summarize_narrations,
+            "get_sfx": self.handle_get_sfx,
+            "tts": self.handle_tts
+        }
+    
+    def _search_sfx(self, query: str) -> list:
+        """
+        Search MyInstants for sound effects and return the list of sounds.
+        Results are reused for SFX_CACHE_TTL seconds; the keyword space is small,
+        so most narrations are served without a network call.
+        Keyed by query only: limits are applied by the callers to the same result list.
+        """
+        with self.sfx_cache_lock:
+            cached = self.sfx_search_cache.get(query)
+            if cached and time.monotonic() - cached[0] < SFX_CACHE_TTL:
+                self.sfx_search_cache.move_to_end(query)
+                return cached[1]
+        
+        response = self.sfx_session.get(
+            MYINSTANTS_SEARCH_URL,
+            params={"q": query},  # Note: parameter is 'q' not 'query'
+            timeout=5
+        )
+        sounds = orjson.loads(response.content).get("data") or []  # Note: key is 'data' not 'results'
+        # Empty results are cached too, so a keyword with no hits isn't searched again until it expires
+        with self.sfx_cache_lock:
+            self.sfx_search_cache[query] = (time.monotonic(), sounds)
+            self.sfx_search_cache.move_to_end(query)
+            while len(self.sfx_search_cache) > SFX_CACHE_MAX_QUERIES:
+                self.sfx_search_cache.popitem(last=False)
+        return sounds
+    
+    async def _prefetch_one_sfx(self, keyword: str) -> list:
+        """Search one keyword for a prefetch; errors give an empty list so the task never raises"""
+        try:
+            return await asyncio.to_thread(self._search_sfx, keyword)
+        except Exception:
+            return []
+    
+    def _start_sfx_prefetch(self, keywords=SFX_PREFETCH_KEYWORDS) -> list:
+        """
+        Start a background search for each keyword whose cached results are missing or expired,
+        unless one is already in flight. Returns the tasks for the keywords being fetched.
+        """
+        now = time.monotonic()
+        with self.sfx_cache_lock:
+            fetched = {keyword: self.sfx_search_cache.get(keyword, (None,))[0] for keyword in keywords}
+        stale = [keyword for keyword, fetched_at in fetched.items() if fetched_at is None or now - fetched_at >= SFX_CACHE_TTL]
+        for keyword in stale:
+            task = self.sfx_prefetch_tasks.get(keyword)
+            if task is None or task.done():
+                self.sfx_prefetch_tasks[keyword] = asyncio.create_task(self._prefetch_one_sfx(keyword))
+        return [self.sfx_prefetch_tasks[keyword] for keyword in stale]
+    
+    async def _find_sfx(self, keyword: str) -> list:
+        """Sounds for keyword, reusing its in-flight prefetch before falling back to a fresh search"""
+        task = self.sfx_prefetch_tasks.get(keyword)
+        if task is not None and not task.done():  # A finished prefetch already filled the cache
+            sounds = await task
+            if sounds:
+                return sounds
+        return await asyncio.to_thread(self._search_sfx, keyword)
+    
+    def _load_screenshot(self, path: Path) -> dict:
+        """
+        Read and hash a screenshot, reusing the cached copy while its mtime is unchanged.
+        Returns a dict with the raw bytes, cache digest and downscaled JPEG (filled lazily).
+        """
+        key = (path, path.stat().st_mtime_ns)
+        with self.image_cache_lock:
+            entry = self.image_cache.get(key)
+            if entry is not None:
+                self.image_cache.move_to_end(key)
+                return entry
+        
+        data = path.read_bytes()
+        entry = {"data": data, "digest": GeminiCache.hash_image(data), "jpeg": None}
+        with self.image_cache_lock:
+            self.image_cache[key] = entry
+            while len(self.image_cache) > self.max_cached_images:
+                self.image_cache.popitem(last=False)
+        return entry
+    
+    def _prune_screenshots(self):
+        """Delete screenshots beyond max_screenshots and drop their loaded copies"""
+        removed = set(cleanup_old_screenshots(self.screenshot_dir, self.max_screenshots))
+        if not removed:
+            return
+        with self.image_cache_lock:
+            for key in [key for key in self.image_cache if key[0] in removed]:
+                del self.image_cache[key]
+    
+    def _downscaled_jpeg(self, entry: dict) -> bytes:
+        """Downscaled JPEG for a loaded screenshot, computed once per entry"""
+        if entry["jpeg"] is None:
+            entry["jpeg"] = downscale_image(entry["data"], self.max_image_edge)
+        return entry["jpeg"]
+    
+    def _generate_text(self, prompt: str, screenshots: list[Path] = (), model=None) -> str:
+        """
+        Generate a Gemini response for the prompt and screenshots (in send order).
+        Identical prompt + screenshot bytes are answered from the response cache.
+        Uses the plain Gemini model unless another model is given.
+        """
+        model = model or self.gemini_model
+        # Read and hash all screenshots concurrently (file I/O and md5 release the GIL)
+        images = list(self.image_pool.map(self._load_screenshot, screenshots))
+        cache_key = self.gemini_cache.make_key(repr(model), prompt, [img["digest"] for img in images])
+        cached = self.gemini_cache.get(cache_key)
+        if cached is not None:
+            print("⚡ Gemini cache hit", file=sys.stderr)
+            return cached
+        
+        # Downscaled JPEGs are a fraction of the full-resolution PNG upload
+        content = [prompt]
+        content.extend(
+            {"mime_type": "image/jpeg", "data": data}
+            for data in self.image_pool.map(self._downscaled_jpeg, images)
+        )
+        response = model.generate_content(content)
+        text = response.text.strip()
+        
+        self.gemini_cache.put(cache_key, text)
+        return text
     
     def _select_unique_sfx(self, available_sounds: list, max_attempts: int = 5) -> Optional[dict]:
         """
@@ -71,18 +259,61 @@ class ToolHandlers:
                 if len(self.recent_sfx) > self.max_recent_sfx:
                     self.recent_sfx.pop(0)
                 
-                print(f"🎲 Selected: '{sfx_id}' (attempt {attempt + 1}, {len(self.recent_sfx)} in history)")
+                print(f"🎲 Selected: '{sfx_id}' (attempt {attempt + 1}, {len(self.recent_sfx)} in history)", file=sys.stderr)
                 return sfx
         
         # If all attempts failed, just pick one and reset the window
-        print(f"⚠️  All SFX recently used, resetting window")
+        print("⚠️  All SFX recently used, resetting window", file=sys.stderr)
         sfx = random.choice(available_sounds)
         self.recent_sfx = [sfx.get("title", "")]
         return sfx
     
+    def _minecraft_context(self) -> str:
+        """Serialized Minecraft events for the prompt templates ("" if there are none)"""
+        snapshot = self.minecraft_snapshot  # Read once; get_minecraft_input swaps in a new snapshot
+        if not snapshot or not snapshot.data:
+            return ""
+        # The templates already label the events, so this is just the JSON
+        return snapshot.json
+    
+    def _synthesize_to_file(self, text: str, output_path: Path):
+        """Prune old narration files, then stream ElevenLabs TTS for the text into an MP3 file"""
+        # Cleanup old narration files (SFX cache is preserved); done here so the unlinks stay off the event loop
+        cleanup_old_audio(self.screenshot_dir, 10)
+        
+        # Streaming endpoint yields MP3 chunks while synthesis is still running
+        # (named convert_as_stream in elevenlabs 1.x, stream in 2.x)
+        tts = self.elevenlabs_client.text_to_speech
+        stream_tts = getattr(tts, "stream", None) or tts.convert_as_stream
+        audio = stream_tts(
+            voice_id=ELEVENLABS_VOICE_ID,
+            text=text,
+            model_id="eleven_multilingual_v2"
+        )
+        
+        # Save audio file as chunks arrive (writelines iterates the stream in C, no per-chunk call)
+        with open(output_path, "wb", buffering=AUDIO_WRITE_BUFFER) as f:
+            f.writelines(audio)
+    
+    async def warm_connections(self):
+        """
+        Open the Gemini, ElevenLabs and MyInstants connections before the first tool call,
+        so it doesn't pay the TLS handshakes. Also primes the SFX cache for every keyword.
+        Failures are ignored; the real calls report their own errors.
+        """
+        warmups = (
+            lambda: self.gemini_model.count_tokens("ping"),
+            lambda: self.elevenlabs_client.voices.get(ELEVENLABS_VOICE_ID)
+        )
+        await asyncio.gather(
+            *(asyncio.to_thread(warmup) for warmup in warmups),
+            *self._start_sfx_prefetch(SFX_KEYWORDS),
+            return_exceptions=True
+        )
+    
     async def handle_get_screenshot(self, arguments: dict) -> list[TextContent | ImageContent]:
         """Get the last screenshots"""
-        cleanup_old_screenshots(self.screenshot_dir, self.max_screenshots)
+        await asyncio.to_thread(self._prune_screenshots)  # Directory scan + unlinks stay off the event loop
         screenshots = get_last_screenshots(self.screenshot_dir, 2)
         
         if not screenshots:
@@ -99,78 +330,45 @@ class ToolHandlers:
         minecraft_data_str = arguments.get("minecraft_data", "{}")
         
         try:
-            current_data = json.loads(minecraft_data_str)
+            current_data = orjson.loads(minecraft_data_str)
             
-            # Save current data
-            with open(self.minecraft_data_file, 'w') as f:
-                json.dump(current_data, f)
+            # Other handlers read this in-memory copy
+            self.minecraft_snapshot = MinecraftSnapshot(current_data, orjson.dumps(current_data).decode())
             
-            # Calculate diff if we have previous data
-            diff_info = ""
-            if self.last_minecraft_data:
-                diff_info = f"\nPrevious: {json.dumps(self.last_minecraft_data)}\nCurrent: {json.dumps(current_data)}"
-            else:
-                diff_info = f"\nFirst data: {json.dumps(current_data)}"
-            
-            self.last_minecraft_data = current_data
-            
-            return [TextContent(type="text", text=f"Minecraft data received{diff_info}")]
-        except json.JSONDecodeError:
+            # Fixed-size acknowledgement; echoing the data back cost a full copy per event over stdio
+            count = len(current_data) if isinstance(current_data, list) else 1
+            return [TextContent(type="text", text=f"Minecraft data received ({count} events)")]
+        except orjson.JSONDecodeError:
             return [TextContent(type="text", text="Invalid JSON data")]
     
     async def handle_describe(self, arguments: dict) -> list[TextContent | ImageContent]:
         """Describe changes from screenshots and/or Minecraft data"""
+        # describe followed by narrate is two Gemini round trips; the fused tool does it in one
+        if arguments.get("and_narrate"):
+            return await self.handle_describe_for_narration(arguments)
+        
         image_count = arguments.get("image_count", 2)
         include_minecraft = arguments.get("include_minecraft", False)
         
-        # Get screenshots if requested
+        # Get screenshots if requested (prompts cover at most two)
         screenshots = []
         if image_count > 0:
-            screenshots = get_last_screenshots(self.screenshot_dir, image_count)
+            screenshots = get_last_screenshots(self.screenshot_dir, min(image_count, 2))
         
         # Get Minecraft data if requested
-        minecraft_context = ""
-        if include_minecraft and self.last_minecraft_data:
-            minecraft_context = f"\n\nMinecraft events: {json.dumps(self.last_minecraft_data)}"
+        minecraft_context = self._minecraft_context() if include_minecraft else ""
         
         # Validate at least one input
         if not screenshots and not minecraft_context:
             return [TextContent(type="text", text="No data available. Need screenshots or Minecraft data.")]
         
         # Build prompt for Gemini - integrate both sources when available
-        content = []
+        prompt = DESCRIBE_PROMPTS[(len(screenshots), bool(minecraft_context))].substitute(
+            minecraft_context=minecraft_context
+        )
         
-        if len(screenshots) == 2 and minecraft_context:
-            # Both screenshots and Minecraft data
-            prompt = f"""In 1-2 sentences, describe in detail what is happening by combining:
-1. In sequence the visuals of the two screenshots (first is older, second is newer)
-2. Minecraft gameplay events: {minecraft_context}
-
-Connect the on-screen activity with the in-game actions to tell a cohesive story."""
-            content.append(prompt)
-            images = [Image.open(img) for img in reversed(screenshots)]
-            content.extend(images)
-        elif len(screenshots) == 2:
-            # Only screenshots
-            prompt = "In 1-2 sentences, describe what is happening within the last two screenshots as a sequence in detail (first is older, second is newer)."
-            content.append(prompt)
-            images = [Image.open(img) for img in reversed(screenshots)]
-            content.extend(images)
-        elif len(screenshots) == 1:
-            # Single screenshot
-            prompt = "In 1-2 sentences, describe what is happening in this screenshot in detail."
-            if minecraft_context:
-                prompt += f"\n\nMinecraft events: {minecraft_context}"
-            content.append(prompt)
-            content.append(Image.open(screenshots[0]))
-        else:
-            # Only Minecraft data
-            prompt = f"In 1-2 sentences, describe what is happening based on these Minecraft events: {minecraft_context}"
-            content.append(prompt)
-        
-        # Generate description
-        response = self.gemini_model.generate_content(content)
-        description = response.text.strip()
+        # Generate description (screenshots are sent oldest first)
+        description = await asyncio.to_thread(self._generate_text, prompt, list(reversed(screenshots)))
         
         return [TextContent(type="text", text=description)]
     
@@ -178,9 +376,8 @@ Connect the on-screen activity with the in-game actions to tell a cohesive story
         """Generate funny narration from description"""
         description = arguments["description"]
         
-        prompt = f"Based on this description: '{description}'\n\nGenerate ONE sentence of funny, sarcastic sports-commentator-style narration. Be creative and entertaining!"
-        response = self.gemini_model.generate_content(prompt)
-        narration = response.text.strip()
+        prompt = NARRATE_PROMPT.substitute(description=description)
+        narration = await asyncio.to_thread(self._generate_text, prompt)
         
         return [TextContent(type="text", text=narration)]
 
@@ -192,110 +389,47 @@ Connect the on-screen activity with the in-game actions to tell a cohesive story
         activity_mode = arguments.get("activity_mode", "unknown")
         explicit = arguments.get("explicit", True)
         
-        # Get screenshots if requested
+        # Store Minecraft data sent inline (saves a separate get_minecraft_input call)
+        if arguments.get("minecraft_data"):
+            await self.handle_get_minecraft_input({"minecraft_data": arguments["minecraft_data"]})
+        
+        # Get screenshots if requested (prompts cover at most two)
         screenshots = []
         if image_count > 0:
-            screenshots = get_last_screenshots(self.screenshot_dir, image_count)
+            screenshots = get_last_screenshots(self.screenshot_dir, min(image_count, 2))
         
         # Get Minecraft data if requested
-        minecraft_context = ""
-        if include_minecraft and self.last_minecraft_data:
-            minecraft_context = f"\n\nMinecraft events: {json.dumps(self.last_minecraft_data)}"
+        minecraft_context = self._minecraft_context() if include_minecraft else ""
         
         # Validate at least one input
         if not screenshots and not minecraft_context:
             return [TextContent(type="text", text="No data available. Need screenshots or Minecraft data.")]
         
         # Build prompt for Gemini
-        content = []
-        
-        if len(screenshots) == 2 and minecraft_context:
-            prompt = f"""Analyze these two screenshots (first is older, second is newer) and Minecraft events: {minecraft_context}
-
-Generate ONE sentence of funny, sarcastic sports-commentator-style narration about what's happening.
-Then suggest ONE sound effect keyword that would be funny with this narration.
-
-Respond in JSON format:
-{{"narration": "your funny narration here", "sfx_keyword": "keyword"}}
-
-Sound effect keywords: bruh, laugh, explosion, wow, scream, crash, fail, epic, oof, yeet"""
-            content.append(prompt)
-            images = [Image.open(img) for img in reversed(screenshots)]
-            content.extend(images)
-        elif len(screenshots) == 2:
-            prompt = """Analyze these two screenshots (first is older, second is newer).
-
-Generate ONE sentence of funny, sarcastic sports-commentator-style narration about what's happening.
-Then suggest ONE sound effect keyword that would be funny with this narration.
-
-Respond in JSON format:
-{"narration": "your funny narration here", "sfx_keyword": "keyword"}
-
-Sound effect keywords: bruh, laugh, explosion, wow, scream, crash, fail, epic, oof, yeet"""
-            content.append(prompt)
-            images = [Image.open(img) for img in reversed(screenshots)]
-            content.extend(images)
-        elif len(screenshots) == 1:
-            prompt = f"""Analyze this screenshot{minecraft_context and f' and Minecraft events: {minecraft_context}' or ''}.
-
-Generate ONE sentence of funny, sarcastic sports-commentator-style narration about what's happening.
-Then suggest ONE sound effect keyword that would be funny with this narration.
-
-Respond in JSON format:
-{{"narration": "your funny narration here", "sfx_keyword": "keyword"}}
-
-Sound effect keywords: bruh, laugh, explosion, wow, scream, crash, fail, epic, oof, yeet"""
-            content.append(prompt)
-            content.append(Image.open(screenshots[0]))
+        if screenshots:
+            prompt = NARRATION_PROMPTS[(len(screenshots), bool(minecraft_context))].substitute(
+                minecraft_context=minecraft_context
+            )
         else:
-            # Build style guide based on explicit setting
-            if explicit:
-                style_guide = """Style: Funny, sarcastic sports-commentator. Be insulting and personal. Use profanity freely: dumbass, this fucker, birdbrain, asshole, bimbo, bonehead, cocksucker, cunt, wanker, dick, dipshit, dork, fatso, pisser, turd, twat, wimp, wuss, bozo, buffoon, moron, goon, imbecile. Don't hold back!"""
-            else:
-                style_guide = """Style: Act like a stand-up comedian doing crowd work! Be funny and positive using Reddit/meme culture. Reference popular memes, Reddit culture, gaming references, and internet humor. Be playful and encouraging while still being sarcastic. Use observational comedy and callbacks. Examples: "This is fine" meme, "Task failed successfully", "Suffering from success", "He's a little confused but he's got the spirit", "Professionals have standards", etc."""
-            
-            # Check for repetitive activity
+            # Minecraft-only narration uses the explicit/family-friendly style guide
             repetition_context = ""
             if is_repetitive:
-                if explicit:
-                    repetition_context = f"""
-
-IMPORTANT: The player has been doing '{activity_mode}' repeatedly! Instead of normal narration, pick ONE of these special modes:
-1. SING: Make up a short silly song about their repetitive behavior (2 lines max)
-2. THERAPY: Act like their therapist, asking why they keep doing this
-3. DAD JOKE: Tell a dad joke related to their activity, then roast them with it
-4. FUN FACT: Share a fun fact, then use it to roast them (e.g., "Did you know pigs don't shower? Does that make you a pig?")
-
-Be creative and mean in a funny way!"""
-                else:
-                    repetition_context = f"""
-
-IMPORTANT: The player has been doing '{activity_mode}' repeatedly! Act like a stand-up comedian noticing this pattern. Pick ONE of these special modes:
-1. MEME: Reference a popular meme that fits their repetitive behavior (like a comedian would)
-2. REDDIT: Make a Reddit-style comment as if you're doing crowd work (like r/madlads or r/me_irl)
-3. GAMING REFERENCE: Reference a popular game/streamer moment with comedic timing
-4. WHOLESOME ROAST: Encourage them but in a hilariously backhanded way (classic stand-up style)
-
-Be creative and funny using internet culture and stand-up comedy techniques!"""
-            
-            prompt = f"""Based on these Minecraft events: {minecraft_context}
-
-{style_guide}{repetition_context}
-
-Generate ONE sentence of funny narration.
-Then suggest ONE sound effect keyword.
-
-Respond in JSON format:
-{{"narration": "your funny narration here", "sfx_keyword": "keyword"}}
-
-Sound effect keywords: bruh, laugh, explosion, wow, scream, crash, fail, epic, oof, yeet"""
-            content.append(prompt)
+                repetition_context = REPETITION_PROMPTS[bool(explicit)].substitute(activity_mode=activity_mode)
+            prompt = MINECRAFT_NARRATION_PROMPTS[bool(explicit)].substitute(
+                minecraft_context=minecraft_context,
+                repetition_context=repetition_context
+            )
+        
+        # The keyword is only known once Gemini answers, so refresh the likeliest keywords meanwhile
+        self._start_sfx_prefetch()
         
-        # Generate narration + SFX keyword
-        response = self.gemini_model.generate_content(content)
-        response_text = response.text.strip()
+        # Generate narration + SFX keyword (screenshots are sent oldest first)
+        # The JSON response format lives in the narration model's system instruction
+        response_text = await asyncio.to_thread(
+            self._generate_text, prompt, list(reversed(screenshots)), self.narration_model
+        )
         
-        print(f"🤖 Gemini response: {response_text[:100]}...")
+        print(f"🤖 Gemini response: {response_text[:100]}...", file=sys.stderr)
         
         # Parse JSON response
         try:
@@ -305,31 +439,25 @@ Sound effect keywords: bruh, laugh, explosion, wow, scream, crash, fail, epic, o
             elif "```" in response_text:
                 response_text = response_text.split("```")[1].split("```")[0].strip()
             
-            data = json.loads(response_text)
+            data = orjson.loads(response_text)
             narration = data.get("narration", response_text)
             sfx_keyword = data.get("sfx_keyword", "bruh")
             
-            print(f"✅ Parsed JSON - narration: {narration[:50]}..., sfx: {sfx_keyword}")
-        except json.JSONDecodeError as e:
+            print(f"✅ Parsed JSON - narration: {narration[:50]}..., sfx: {sfx_keyword}", file=sys.stderr)
+        except orjson.JSONDecodeError as e:
             # Fallback if JSON parsing fails
-            print(f"⚠️  JSON parse failed: {e}, using fallback")
+            print(f"⚠️  JSON parse failed: {e}, using fallback", file=sys.stderr)
             narration = response_text
             sfx_keyword = get_sfx_query_from_narration(narration)
         
         # Search for sound effect
         try:
-            print(f"🔍 Searching SFX for keyword: '{sfx_keyword}'")
-            sfx_response = requests.get(
-                "https://myinstants-api.vercel.app/search",
-                params={"q": sfx_keyword},  # Note: parameter is 'q' not 'query'
-                timeout=5
-            )
-            sfx_data = sfx_response.json()
+            print(f"🔍 Searching SFX for keyword: '{sfx_keyword}'", file=sys.stderr)
+            available_sounds = await self._find_sfx(sfx_keyword)
             
-            if sfx_data.get("data"):  # Note: key is 'data' not 'results'
-                print(f"✅ Found {len(sfx_data['data'])} SFX options")
+            if available_sounds:
+                print(f"✅ Found {len(available_sounds)} SFX options", file=sys.stderr)
                 # Use sliding window to select unique SFX
-                available_sounds = sfx_data["data"]
                 sfx = self._select_unique_sfx(available_sounds)
                 
                 if sfx:
@@ -341,18 +469,53 @@ Sound effect keywords: bruh, laugh, explosion, wow, scream, crash, fail, epic, o
                             "query": sfx_keyword
                         }
                     }
-                    print(f"🎵 Selected SFX: {sfx.get('title')} - URL: {sfx.get('mp3', 'NO URL')[:50]}")
+                    print(f"🎵 Selected SFX: {sfx.get('title')} - URL: {sfx.get('mp3', 'NO URL')[:50]}", file=sys.stderr)
                 else:
-                    print(f"⚠️  No unique SFX found")
+                    print("⚠️  No unique SFX found", file=sys.stderr)
                     result = {"narration": narration, "sfx": None}
             else:
-                print(f"⚠️  No SFX results from API")
+                print("⚠️  No SFX results from API", file=sys.stderr)
                 result = {"narration": narration, "sfx": None}
         except Exception as e:
-            print(f"❌ SFX search error: {e}")
+            print(f"❌ SFX search error: {e}", file=sys.stderr)
             result = {"narration": narration, "sfx": None}
         
-        return [TextContent(type="text", text=json.dumps(result))]
+        return [TextContent(type="text", text=orjson.dumps(result).decode())]
+    
+    async def handle_narrate_from_context(self, arguments: dict) -> list[TextContent | ImageContent]:
+        """Prune screenshots, store Minecraft data, and narrate, in one tool call"""
+        await asyncio.to_thread(self._prune_screenshots)  # Directory scan + unlinks stay off the event loop
+        
+        narration_args = dict(arguments)
+        narration_args.setdefault("include_minecraft", "minecraft_data" in arguments)
+        return await self.handle_describe_for_narration(narration_args)
+    
+    async def handle_process_batch(self, arguments: dict) -> list[TextContent | ImageContent]:
+        """Store Minecraft data, narrate it, and optionally synthesize the narration, in one tool call"""
+        async with self.gemini_sema:
+            result = await self.handle_describe_for_narration({
+                "minecraft_data": arguments["minecraft_data"],
+                "image_count": 0,
+                "include_minecraft": True,
+                "is_repetitive": arguments.get("is_repetitive", False),
+                "activity_mode": arguments.get("activity_mode", "unknown"),
+                "explicit": arguments.get("explicit", True)
+            })
+        
+        output_file = arguments.get("output_file")
+        if not output_file:
+            return result
+        
+        try:
+            data = orjson.loads(result[0].text)
+        except orjson.JSONDecodeError:
+            # Not narration JSON (e.g. no Minecraft data) - nothing to synthesize
+            return result
+        
+        async with self.synth_sema:
+            tts_result = await self.handle_tts({"text": data["narration"], "output_file": output_file})
+        data["tts"] = tts_result[0].text
+        return [TextContent(type="text", text=orjson.dumps(data).decode())]
     
     async def handle_summarize_narrations(self, arguments: dict) -> list[TextContent | ImageContent]:
         """Summarize multiple narrations into one sentence"""
@@ -361,14 +524,12 @@ Sound effect keywords: bruh, laugh, explosion, wow, scream, crash, fail, epic, o
         if len(narrations) == 1:
             return [TextContent(type="text", text=narrations[0])]
         
-        prompt = f"""Summarize these {len(narrations)} narrations into ONE concise, funny sentence that captures the key action:
-
-{chr(10).join(f'{i+1}. {n}' for i, n in enumerate(narrations))}
-
-Keep the sarcastic sports-commentator style. ONE sentence only!"""
+        prompt = SUMMARIZE_PROMPT.substitute(
+            count=len(narrations),
+            narrations="\n".join(f"{i+1}. {n}" for i, n in enumerate(narrations))
+        )
         
-        response = self.gemini_model.generate_content(prompt)
-        summary = response.text.strip()
+        summary = await asyncio.to_thread(self._generate_text, prompt)
         
         return [TextContent(type="text", text=summary)]
     
@@ -378,25 +539,20 @@ Keep the sarcastic sports-commentator style. ONE sentence only!"""
         limit = arguments.get("limit", 3)
         
         try:
-            response = requests.get(
-                "https://myinstants-api.vercel.app/search",
-                params={"q": query},
-                timeout=5
-            )
-            data = response.json()
+            sounds = await asyncio.to_thread(self._search_sfx, query)
             
-            if not data.get("data"):
+            if not sounds:
                 return [TextContent(type="text", text=f"No sound effects found for '{query}'")]
             
             results = []
-            for sfx in data["data"][:limit]:  # Limit results manually
+            for sfx in sounds[:limit]:  # Limit results manually
                 results.append({
                     "title": sfx.get("title", "Unknown"),
                     "mp3": sfx.get("mp3", ""),
                     "query": query
                 })
             
-            return [TextContent(type="text", text=json.dumps(results))]
+            return [TextContent(type="text", text=orjson.dumps(results).decode())]
         except Exception as e:
             return [TextContent(type="text", text=f"Error searching sound effects: {str(e)}")]
     
@@ -405,22 +561,9 @@ Keep the sarcastic sports-commentator style. ONE sentence only!"""
         text = arguments["text"]
         output_file = arguments.get("output_file", "narration.mp3")
         
-        # Cleanup old narration files (SFX cache is preserved)
-        cleanup_old_audio(self.screenshot_dir, 10)
-        
-        # Use ElevenLabs TTS with custom voice ID and settings
+        # Use ElevenLabs TTS with custom voice ID and settings (blocking, so run in a thread)
         try:
-            audio = self.elevenlabs_client.text_to_speech.convert(
-                voice_id="nPczCjzI2devNBz1zQrb",  # Brian voice
-                text=text,
-                model_id="eleven_multilingual_v2"
-            )
-            
-            # Save audio file
-            output_path = self.screenshot_dir / output_file
-            with open(output_path, "wb") as f:
-                for chunk in audio:
-                    f.write(chunk)
+            await asyncio.to_thread(self._synthesize_to_file, text, self.screenshot_dir / output_file)
             
             return [TextContent(type="text", text=f"Audio saved to {output_file}")]
         except Exception as e:
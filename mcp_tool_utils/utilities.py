@@ -6,31 +6,139 @@ An LLM has indirect access to these via the MCP tools
 """
 
 import os
+import io
+import mmap
 import base64
+import threading
 from pathlib import Path
+from PIL import Image
 
 
-def cleanup_old_screenshots(screenshot_dir: Path, max_screenshots: int = 5):
-    """Keep only the last MAX_SCREENSHOTS images"""
-    screenshots = sorted(screenshot_dir.glob("*.png"), key=os.path.getmtime)
-    while len(screenshots) > max_screenshots:
-        oldest = screenshots.pop(0)
-        oldest.unlink()
+SCREENSHOT_SUFFIXES = (".png", ".jpg")  # Clients save JPEG; PNG still accepted
+
+
+def _files_by_mtime(directory: Path, matches) -> list:
+    """
+    Files in the directory whose name passes matches(), oldest first.
+    One scandir pass; mtimes come from the DirEntry instead of a stat per path.
+    """
+    found = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not (matches(entry.name) and entry.is_file()):
+                continue
+            try:
+                found.append((entry.stat().st_mtime, entry.path))
+            except FileNotFoundError:
+                continue  # Removed between listing and stat
+    found.sort()
+    return [Path(path) for _, path in found]
+
+
+def _is_screenshot(name: str) -> bool:
+    """True for screenshot image file names"""
+    return name.endswith(SCREENSHOT_SUFFIXES)
+
+
+def _is_narration_audio(name: str) -> bool:
+    """True for narration MP3 file names (not SFX cache files)"""
+    return name.startswith("narration_") and name.endswith(".mp3")
+
+
+# Directory mtime after the last cleanup pass, per (directory, kind); unchanged means nothing to prune
+_cleaned_dir_mtimes = {}
+
+# Handlers prune from worker threads; serialize passes so two never delete from the same listing
+_prune_lock = threading.Lock()
+
+
+def _prune_oldest(directory: Path, matches, keep: int) -> list:
+    """Delete all but the newest `keep` matching files; returns the removed paths"""
+    key = (directory, matches)
+    with _prune_lock:
+        dir_mtime_ns = os.stat(directory).st_mtime_ns
+        if _cleaned_dir_mtimes.get(key) == dir_mtime_ns:
+            return []
+        
+        files = _files_by_mtime(directory, matches)
+        removed = files[:max(len(files) - keep, 0)]
+        for path in removed:
+            path.unlink(missing_ok=True)  # Another process may have removed it since the scan
+        _cleaned_dir_mtimes[key] = os.stat(directory).st_mtime_ns
+        return removed
+
+
+# Screenshots oldest first, per directory, with the directory mtime they were listed at.
+# Shared by cleanup_old_screenshots and get_last_screenshots so a prune + listing is one scan.
+_screenshot_index = {}
+
+
+def _screenshots_by_mtime(screenshot_dir: Path) -> tuple:
+    """Screenshots oldest first; rescans only when the directory's mtime has changed"""
+    dir_mtime_ns = os.stat(screenshot_dir).st_mtime_ns
+    cached = _screenshot_index.get(screenshot_dir)
+    if cached and cached[0] == dir_mtime_ns:
+        return cached[1]
+    
+    screenshots = tuple(_files_by_mtime(screenshot_dir, _is_screenshot))
+    _screenshot_index[screenshot_dir] = (dir_mtime_ns, screenshots)
+    return screenshots
+
+
+def cleanup_old_screenshots(screenshot_dir: Path, max_screenshots: int = 5) -> list:
+    """Keep only the last MAX_SCREENSHOTS images; returns the paths that were removed"""
+    with _prune_lock:
+        screenshots = _screenshots_by_mtime(screenshot_dir)
+        removed = list(screenshots[:max(len(screenshots) - max_screenshots, 0)])
+        if not removed:
+            return removed
+        
+        for path in removed:
+            path.unlink(missing_ok=True)  # Another process may have removed it since the scan
+        
+        # Our unlinks changed the directory mtime. Re-index the kept list without re-statting each file,
+        # unless the name listing shows another process added or removed a screenshot meanwhile.
+        kept = screenshots[len(removed):]
+        dir_mtime_ns = os.stat(screenshot_dir).st_mtime_ns
+        names = {name for name in os.listdir(screenshot_dir) if _is_screenshot(name)}
+        if names == {path.name for path in kept}:
+            _screenshot_index[screenshot_dir] = (dir_mtime_ns, kept)
+        return removed
 
 
 def cleanup_old_audio(screenshot_dir: Path, max_audio: int = 10):
     """Keep only the last N narration audio files (excludes SFX cache)"""
     # Only cleanup narration files, not SFX cache
-    narration_files = sorted(screenshot_dir.glob("narration_*.mp3"), key=os.path.getmtime)
-    while len(narration_files) > max_audio:
-        oldest = narration_files.pop(0)
-        oldest.unlink()
+    _prune_oldest(screenshot_dir, _is_narration_audio, max_audio)
 
 
 def encode_image(image_path: Path) -> str:
-    """Encode image to base64"""
+    """Encode image to base64 (encodes straight from a memory map instead of reading a copy)"""
     with open(image_path, "rb") as f:
-        return base64.b64encode(f.read()).decode("utf-8")
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""  # mmap can't map an empty file
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return base64.b64encode(mapped).decode("ascii")
+
+
+def downscale_image(image_bytes: bytes, max_size: int = 768, quality: int = 80) -> bytes:
+    """
+    Shrink an image to max_size on its longest edge and re-encode it as JPEG.
+    Gemini views images at a much lower resolution than full screenshots,
+    so this cuts upload size without losing anything the model would see.
+    """
+    with Image.open(io.BytesIO(image_bytes)) as img:
+        # Already a small enough JPEG: send the file bytes as-is (open only parsed the header)
+        if img.format == "JPEG" and max(img.size) <= max_size:
+            return image_bytes
+        
+        # JPEG sources (what the clients save) decode straight at a reduced scale; no-op for PNG
+        img.draft("RGB", (max_size, max_size))
+        img = img.convert("RGB")  # JPEG has no alpha channel
+        img.thumbnail((max_size, max_size))
+        buffer = io.BytesIO()
+        img.save(buffer, "JPEG", quality=quality)
+        return buffer.getvalue()
 
 
 def get_sfx_query_from_narration(narration: str) -> str:
@@ -60,6 +168,10 @@ def get_sfx_query_from_narration(narration: str) -> str:
 
 
 def get_last_screenshots(screenshot_dir: Path, count: int = 2):
-    """Get the last N screenshots from the directory"""
-    screenshots = sorted(screenshot_dir.glob("*.png"), key=os.path.getmtime, reverse=True)
-    return screenshots[:count]
+    """
+    Get the last N screenshots from the directory, newest first.
+    Served from the shared screenshot index, which is only rebuilt when the
+    directory's mtime changes (i.e. a file was added or removed).
+    """
+    screenshots = _screenshots_by_mtime(screenshot_dir)
+    return list(reversed(screenshots[-count:])) if count > 0 else []
@@ -9,9 +9,12 @@ import json
 from pathlib import Path
 from datetime import datetime
 import os
+import signal
+import sys
 from dotenv import load_dotenv
 import queue
 import threading
+from collections import deque
 
 load_dotenv()
 
@@ -20,12 +23,14 @@ app = Flask(__name__)
 SCREENSHOT_DIR = Path(os.getenv("SCREENSHOT_DIR", "./screenshots"))
 SCREENSHOT_DIR.mkdir(exist_ok=True)
 MINECRAFT_DATA_FILE = SCREENSHOT_DIR / "minecraft_data.json"
+MINECRAFT_EVENTS_LOG = SCREENSHOT_DIR / "minecraft_events.ndjson"  # Append-only, one event per line
+RECEIVER_PID_FILE = SCREENSHOT_DIR / "receiver.pid"  # Lets clients see the receiver is already running
 
-# Store events in memory
-minecraft_events = []
+# Store events in memory (keep last 10)
+minecraft_events = deque(maxlen=10)
 
 # SSE listeners
-listeners = []
+listeners = set()
 listeners_lock = threading.Lock()
 
 @app.route('/mcp', methods=['POST'])
@@ -48,24 +53,26 @@ def receive_minecraft_event():
             'event_source': event_source
         }
         
-        # Add to events list (keep last 10)
+        # Add to events (deque evicts the oldest beyond 10)
         minecraft_events.append(event)
-        if len(minecraft_events) > 10:
-            minecraft_events.pop(0)
         
         # Save to file
         with open(MINECRAFT_DATA_FILE, 'w') as f:
-            json.dump(minecraft_events, f, indent=2)
+            json.dump(list(minecraft_events), f, indent=2)
+        
+        # Append to the event log so clients can tail new events instead of re-parsing the file
+        with open(MINECRAFT_EVENTS_LOG, 'a') as f:
+            f.write(json.dumps(event) + "\n")
         
         print(f"📦 Minecraft event: {event_type} - {event_source}")
         
         # Notify SSE listeners
         with listeners_lock:
-            for q in listeners[:]:
+            for q in tuple(listeners):
                 try:
                     q.put(event)
                 except:
-                    listeners.remove(q)
+                    listeners.discard(q)
         
         return jsonify({
             "status": "success",
@@ -82,7 +89,7 @@ def receive_minecraft_event():
 @app.route('/mcp/events', methods=['GET'])
 def get_events():
     """Get all stored events"""
-    return jsonify(minecraft_events)
+    return jsonify(list(minecraft_events))
 
 @app.route('/mcp/clear', methods=['POST'])
 def clear_events():
@@ -90,6 +97,8 @@ def clear_events():
     minecraft_events.clear()
     if MINECRAFT_DATA_FILE.exists():
         MINECRAFT_DATA_FILE.unlink()
+    if MINECRAFT_EVENTS_LOG.exists():
+        MINECRAFT_EVENTS_LOG.unlink()
     return jsonify({"status": "success", "message": "Events cleared"})
 
 @app.route('/stream')
@@ -99,11 +108,11 @@ def stream():
         q = queue.Queue()
         
         with listeners_lock:
-            listeners.append(q)
+            listeners.add(q)
         
         try:
             # Send recent events first
-            for event in minecraft_events[-10:]:
+            for event in list(minecraft_events):
                 yield f"data: {json.dumps(event)}\n\n"
             
             # Stream new events
@@ -112,8 +121,7 @@ def stream():
                 yield f"data: {json.dumps(event)}\n\n"
         except GeneratorExit:
             with listeners_lock:
-                if q in listeners:
-                    listeners.remove(q)
+                listeners.discard(q)
     
     return Response(event_stream(), mimetype='text/event-stream')
 
@@ -289,7 +297,21 @@ def index():
 """
 
 if __name__ == '__main__':
+    from werkzeug.serving import make_server
+    
+    # Bind first, so a second receiver fails before touching the running one's pidfile or event log
+    server = make_server('0.0.0.0', 8080, app, threaded=True)
     print("🎮 Minecraft Mod Receiver Started")
     print("📡 Listening on http://localhost:8080/mcp")
     print("Press Ctrl+C to stop\n")
-    app.run(host='0.0.0.0', port=8080, debug=False)
+    # Start a fresh event log each session (tailing clients reset when it shrinks)
+    MINECRAFT_EVENTS_LOG.write_text("")
+    RECEIVER_PID_FILE.write_text(str(os.getpid()))
+    # Clients stop the receiver with terminate() (SIGTERM); exit through the finally below
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        RECEIVER_PID_FILE.unlink(missing_ok=True)